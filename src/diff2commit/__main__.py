@@ -0,0 +1,26 @@
+"""Console entry point for diff2commit."""
+
+import sys
+
+
+def main() -> None:
+    """Run the CLI, answering a bare ``version`` without loading it.
+
+    Importing the Typer app pulls in pydantic, Rich and GitPython, which
+    dominates the run time of a command that only prints one line.
+    """
+    if sys.argv[1:] == ["version"]:
+        from diff2commit.__version__ import __version__
+
+        print(f"\ndiff2commit version {__version__}")
+        print("Default: OpenRouter Qwen 2.5 Coder 32B (FREE)")
+        print("Also supports: OpenAI GPT, Google Gemini (requires API key)\n")
+        return
+
+    from diff2commit.cli import main as cli_main
+
+    cli_main()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,36 @@
-"""AI provider implementations."""
+"""AI provider implementations.
+
+Concrete providers are imported on first access so that loading the package
+does not pull in every provider's SDK.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any, Dict
 
 from diff2commit.ai_providers.base import AIProvider, CommitMessage
-from diff2commit.ai_providers.gemini_provider import GeminiProvider
-from diff2commit.ai_providers.openai_provider import OpenAIProvider
-from diff2commit.ai_providers.openrouter_provider import OpenRouterProvider
+
+if TYPE_CHECKING:
+    from diff2commit.ai_providers.gemini_provider import GeminiProvider
+    from diff2commit.ai_providers.openai_provider import OpenAIProvider
+    from diff2commit.ai_providers.openrouter_provider import OpenRouterProvider
+
+# Provider class name -> defining submodule
+_LAZY_PROVIDERS: Dict[str, str] = {
+    "OpenRouterProvider": "openrouter_provider",
+    "OpenAIProvider": "openai_provider",
+    "GeminiProvider": "gemini_provider",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import provider classes on first access (PEP 562)."""
+    module_name = _LAZY_PROVIDERS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value
+    return value
 
 
 __all__ = ["AIProvider", "CommitMessage", "OpenRouterProvider", "OpenAIProvider", "GeminiProvider"]
@@ -0,0 +1,19 @@
+"""Shared HTTP client for OpenAI-compatible providers."""
+
+import functools
+
+from openai import DefaultHttpxClient
+
+
+@functools.lru_cache(maxsize=None)
+def get_shared_http_client() -> DefaultHttpxClient:
+    """Get the process-wide HTTP client used by the OpenAI SDK.
+
+    Sharing one client lets every OpenAI and OpenRouter provider instance
+    draw from the same keep-alive connection pool, so only the first
+    request pays for the TCP and TLS handshake.
+
+    Returns:
+        HTTP client with the SDK's default limits and redirect behaviour
+    """
+    return DefaultHttpxClient()
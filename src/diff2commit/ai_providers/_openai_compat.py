@@ -0,0 +1,415 @@
+"""Shared implementation for providers that speak the OpenAI chat completions API."""
+
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from openai import AsyncOpenAI, AuthenticationError, OpenAI, OpenAIError, RateLimitError
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+from diff2commit.ai_providers._http import get_shared_http_client
+from diff2commit.ai_providers.base import AIProvider, CommitMessage
+from diff2commit.retry import aretry_call, retry_call
+
+
+class OpenAICompatibleProvider(AIProvider):
+    """Base class for providers served through the OpenAI SDK.
+
+    Subclasses set ``api_label`` and may override the hooks
+    :meth:`_check_rate_limit`, :meth:`_rate_limit_exhausted`,
+    :meth:`_request_kwargs` and :meth:`_message_cost`.
+    """
+
+    # Service name used in error messages
+    api_label: str = ""
+
+    def __init__(
+        self,
+        config: Any,
+        base_url: Optional[str] = None,
+        default_headers: Optional[Dict[str, str]] = None,
+    ):
+        """Initialize the sync and async clients.
+
+        Args:
+            config: Configuration object
+            base_url: API endpoint, or None for the SDK default
+            default_headers: Headers sent with every request
+        """
+        super().__init__(config)
+
+        client_kwargs: Dict[str, Any] = {
+            "api_key": config.api_key,
+            "base_url": base_url,
+            "timeout": config.timeout,
+            "default_headers": default_headers,
+        }
+        self.client = OpenAI(**client_kwargs, http_client=get_shared_http_client())
+        self.aclient = AsyncOpenAI(**client_kwargs)
+        self.model = config.ai_model
+
+    def generate_commit_message(self, diff: str, context: Dict[str, Any]) -> CommitMessage:
+        """Generate a commit message.
+
+        Args:
+            diff: Git diff text
+            context: Additional context
+
+        Returns:
+            CommitMessage object
+        """
+        prompt = self._build_user_prompt(diff, context)
+        return self._cached_generate(prompt, self._system_prompt, lambda: self._complete(prompt))
+
+    async def agenerate_commit_message(self, diff: str, context: Dict[str, Any]) -> CommitMessage:
+        """Asynchronously generate a commit message.
+
+        Args:
+            diff: Git diff text
+            context: Additional context
+
+        Returns:
+            CommitMessage object
+        """
+        prompt = self._build_user_prompt(diff, context)
+        return await self._acached_generate(
+            prompt, self._system_prompt, lambda: self._acomplete(prompt)
+        )
+
+    def stream_commit_message(
+        self, diff: str, context: Dict[str, Any], on_token: Callable[[str], None]
+    ) -> CommitMessage:
+        """Generate a commit message, streaming the response.
+
+        Args:
+            diff: Git diff text
+            context: Additional context
+            on_token: Callback invoked with each piece of generated text
+
+        Returns:
+            CommitMessage object
+        """
+        prompt = self._build_user_prompt(diff, context)
+        message = self._cached_generate(
+            prompt, self._system_prompt, lambda: self._stream(prompt, on_token)
+        )
+        if message.cached:
+            # Nothing was streamed, so report the stored text in one piece
+            on_token(message.raw)
+        return message
+
+    async def astream_commit_message(
+        self, diff: str, context: Dict[str, Any], on_token: Callable[[str], None]
+    ) -> CommitMessage:
+        """Asynchronously generate a commit message, streaming the response.
+
+        Args:
+            diff: Git diff text
+            context: Additional context
+            on_token: Callback invoked with each piece of generated text
+
+        Returns:
+            CommitMessage object
+        """
+        prompt = self._build_user_prompt(diff, context)
+        message = await self._acached_generate(
+            prompt, self._system_prompt, lambda: self._astream(prompt, on_token)
+        )
+        if message.cached:
+            on_token(message.raw)
+        return message
+
+    def generate_candidates(
+        self, diff: str, context: Dict[str, Any], k: int = 3
+    ) -> List[CommitMessage]:
+        """Generate several commit messages in a single request using ``n``.
+
+        Args:
+            diff: Git diff text
+            context: Additional context
+            k: Number of candidates
+
+        Returns:
+            List of CommitMessage objects
+        """
+        prompt = self._build_user_prompt(diff, context)
+        return self._messages_from_response(self._call_llm(prompt, n=k))
+
+    async def aclose(self) -> None:
+        """Close the async client's connection pool."""
+        await self.aclient.close()
+
+    def _complete(self, prompt: str) -> CommitMessage:
+        """Request a completion for the prompt.
+
+        Args:
+            prompt: User prompt
+
+        Returns:
+            CommitMessage object
+        """
+        return self._message_from_response(self._call_llm(prompt))
+
+    async def _acomplete(self, prompt: str) -> CommitMessage:
+        """Asynchronously request a completion for the prompt.
+
+        Args:
+            prompt: User prompt
+
+        Returns:
+            CommitMessage object
+        """
+        return self._message_from_response(await self._acall_llm(prompt))
+
+    def _stream(self, prompt: str, on_token: Callable[[str], None]) -> CommitMessage:
+        """Request a streamed completion for the prompt.
+
+        Args:
+            prompt: User prompt
+            on_token: Callback invoked with each piece of generated text
+
+        Returns:
+            CommitMessage object
+
+        Raises:
+            ValueError: If the API key is invalid
+            RuntimeError: If the API call fails
+        """
+        self._check_rate_limit()
+        kwargs = self._stream_kwargs(prompt)
+        pieces: List[str] = []
+        tokens = 0
+        with self._api_errors():
+            for chunk in self._create(kwargs):
+                tokens = self._consume_chunk(chunk, pieces, on_token) or tokens
+
+        return self._message_from_stream(pieces, tokens)
+
+    async def _astream(self, prompt: str, on_token: Callable[[str], None]) -> CommitMessage:
+        """Asynchronously request a streamed completion for the prompt.
+
+        Args:
+            prompt: User prompt
+            on_token: Callback invoked with each piece of generated text
+
+        Returns:
+            CommitMessage object
+
+        Raises:
+            ValueError: If the API key is invalid
+            RuntimeError: If the API call fails
+        """
+        self._check_rate_limit()
+        kwargs = self._stream_kwargs(prompt)
+        pieces: List[str] = []
+        tokens = 0
+        with self._api_errors():
+            async for chunk in await self._acreate(kwargs):
+                tokens = self._consume_chunk(chunk, pieces, on_token) or tokens
+
+        return self._message_from_stream(pieces, tokens)
+
+    def _stream_kwargs(self, prompt: str) -> Dict[str, Any]:
+        """Build request arguments for a streamed completion that reports usage."""
+        kwargs = self._request_kwargs(prompt)
+        kwargs["stream"] = True
+        kwargs["stream_options"] = {"include_usage": True}
+        return kwargs
+
+    @staticmethod
+    def _consume_chunk(
+        chunk: ChatCompletionChunk, pieces: List[str], on_token: Callable[[str], None]
+    ) -> Optional[int]:
+        """Collect the text of one stream chunk and report it.
+
+        Args:
+            chunk: Streamed completion chunk
+            pieces: Text received so far, extended in place
+            on_token: Callback invoked with the new text
+
+        Returns:
+            Total token usage if the chunk carries it, otherwise None
+        """
+        if chunk.choices and chunk.choices[0].delta.content:
+            piece = chunk.choices[0].delta.content
+            pieces.append(piece)
+            on_token(piece)
+        # Usage arrives on a final chunk without choices
+        return chunk.usage.total_tokens if chunk.usage else None
+
+    def _message_from_stream(self, pieces: List[str], tokens: int) -> CommitMessage:
+        """Convert the text collected from a stream into a CommitMessage.
+
+        Args:
+            pieces: Streamed text pieces
+            tokens: Total tokens reported by the final chunk
+
+        Returns:
+            CommitMessage object
+
+        Raises:
+            RuntimeError: If the stream carried no text
+        """
+        text = "".join(pieces).strip()
+        if not text:
+            raise RuntimeError(f"{self.api_label} returned empty content")
+
+        return self._parse_message(text, tokens, self._message_cost(tokens))
+
+    def _call_llm(self, prompt: str, n: int = 1) -> ChatCompletion:
+        """Send the chat completion request, retrying on rate limits.
+
+        The request arguments are built once, so retries resend the same
+        payload instead of re-templating it.
+
+        Args:
+            prompt: User prompt
+            n: Number of completions to request
+
+        Returns:
+            Chat completion response
+
+        Raises:
+            ValueError: If the API key is invalid
+            RuntimeError: If the API call fails
+        """
+        self._check_rate_limit()
+        kwargs = self._request_kwargs(prompt, n=n)
+        with self._api_errors():
+            response: ChatCompletion = self._create(kwargs)
+        return response
+
+    async def _acall_llm(self, prompt: str, n: int = 1) -> ChatCompletion:
+        """Asynchronously send the chat completion request, retrying on rate limits.
+
+        Args:
+            prompt: User prompt
+            n: Number of completions to request
+
+        Returns:
+            Chat completion response
+
+        Raises:
+            ValueError: If the API key is invalid
+            RuntimeError: If the API call fails
+        """
+        self._check_rate_limit()
+        kwargs = self._request_kwargs(prompt, n=n)
+        with self._api_errors():
+            response: ChatCompletion = await self._acreate(kwargs)
+        return response
+
+    def _create(self, kwargs: Dict[str, Any]) -> Any:
+        """Call ``chat.completions.create``, retrying on rate limits."""
+        return retry_call(
+            lambda: self.client.chat.completions.create(**kwargs),
+            exceptions=(RateLimitError,),
+            attempts=self.config.max_retries,
+            give_up=self._rate_limit_exhausted,
+        )
+
+    async def _acreate(self, kwargs: Dict[str, Any]) -> Any:
+        """Async counterpart of :meth:`_create`."""
+        return await aretry_call(
+            lambda: self.aclient.chat.completions.create(**kwargs),
+            exceptions=(RateLimitError,),
+            attempts=self.config.max_retries,
+            give_up=self._rate_limit_exhausted,
+        )
+
+    @contextmanager
+    def _api_errors(self) -> Iterator[None]:
+        """Translate SDK errors into the exceptions providers raise.
+
+        Raises:
+            ValueError: If the API key is invalid
+            RuntimeError: If the API call fails
+        """
+        try:
+            yield
+        except AuthenticationError as e:
+            raise ValueError(f"Invalid {self.api_label} API key: {e}") from e
+        except OpenAIError as e:
+            raise RuntimeError(f"{self.api_label} API error: {e}") from e
+
+    def _check_rate_limit(self) -> None:
+        """Hook called before each request; raise to fail without sending it."""
+
+    def _rate_limit_exhausted(self, error: BaseException) -> bool:
+        """Hook deciding whether a rate-limit error is re-raised without retrying.
+
+        Args:
+            error: Rate-limit error raised by the SDK
+
+        Returns:
+            True to stop retrying
+        """
+        return False
+
+    def _request_kwargs(self, prompt: str, n: int = 1) -> Dict[str, Any]:
+        """Build the chat completion request arguments.
+
+        Args:
+            prompt: User prompt
+            n: Number of completions to request
+
+        Returns:
+            Keyword arguments for ``chat.completions.create``
+        """
+        kwargs: Dict[str, Any] = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": self._system_prompt},
+                {"role": "user", "content": prompt},
+            ],
+            "max_tokens": self.config.max_tokens,
+            "temperature": self.config.temperature,
+        }
+        if n > 1:
+            kwargs["n"] = n
+        return kwargs
+
+    def _message_cost(self, tokens: int) -> float:
+        """Estimate the cost of a message.
+
+        Args:
+            tokens: Tokens attributed to the message
+
+        Returns:
+            Estimated cost in USD
+        """
+        return self._calculate_cost(tokens, self.model)
+
+    def _message_from_response(self, response: ChatCompletion) -> CommitMessage:
+        """Convert a chat completion response into a CommitMessage.
+
+        Args:
+            response: Chat completion response
+
+        Returns:
+            CommitMessage object
+        """
+        return self._messages_from_response(response)[0]
+
+    def _messages_from_response(self, response: ChatCompletion) -> List[CommitMessage]:
+        """Convert every choice of a chat completion response into a CommitMessage.
+
+        The reported token usage is split evenly across the choices.
+
+        Args:
+            response: Chat completion response
+
+        Returns:
+            List of CommitMessage objects
+
+        Raises:
+            RuntimeError: If no choice carries content
+        """
+        contents = [c.message.content for c in response.choices if c.message.content is not None]
+        if not contents:
+            raise RuntimeError(f"{self.api_label} returned empty content")
+
+        total_tokens = response.usage.total_tokens if response.usage else 0
+        return [
+            self._parse_message(content.strip(), tokens, self._message_cost(tokens))
+            for content, tokens in zip(contents, self._split_tokens(total_tokens, len(contents)))
+        ]
@@ -1,12 +1,79 @@
 """Base abstract class for AI providers."""
 
+import asyncio
+import contextlib
+import functools
+import re
+import sys
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
-from dataclasses import dataclass, field
+from contextvars import ContextVar
+from typing import (
+    TYPE_CHECKING,
+    Awaitable,
+    Callable,
+    Dict,
+    Any,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+from dataclasses import dataclass, field, replace
 from datetime import datetime
 
+from diff2commit.prompts import SYSTEM_PROMPT, build_commit_prompt_cached
 
-@dataclass
+if TYPE_CHECKING:
+    from diff2commit.cache import LLMCache, SemanticCache
+
+# Conventional Commits type prefix, with optional scope and breaking-change marker
+_CONVENTIONAL_RE = re.compile(
+    r"^(?:feat|fix|docs|style|refactor|perf|test|build|ci|chore|revert)(?:\([^)]*\))?!?:"
+)
+
+# Set while requests must reach the API, such as for alternative suggestions
+_SKIP_CACHE: ContextVar[bool] = ContextVar("diff2commit_skip_cache", default=False)
+
+# Line prefixes that start the footer section of a commit message
+_FOOTER_PREFIXES = ("BREAKING CHANGE:", "Refs:", "Closes:")
+
+# Pricing per 1K tokens as (input, output), approximate as of 2025.
+# Keys are lowercase substrings matched in order against the model name.
+PRICING: Dict[str, Tuple[float, float]] = {
+    # OpenAI
+    "gpt-4": (0.03, 0.06),
+    "gpt-4-turbo": (0.01, 0.03),
+    "gpt-3.5-turbo": (0.0005, 0.0015),
+    # Gemini
+    "gemini-pro": (0.00025, 0.0005),
+    "gemini-ultra": (0.001, 0.002),
+    # OpenRouter (non-free models)
+    "qwen": (0.0, 0.0),  # Free tier
+}
+
+
+@functools.lru_cache(maxsize=128)
+def _lookup_price(model_lower: str) -> Optional[Tuple[float, float]]:
+    """Find the pricing entry for a lowercase model name.
+
+    Args:
+        model_lower: Lowercased model name
+
+    Returns:
+        Tuple of (input, output) price per 1K tokens, or None if unknown
+    """
+    for model_name, prices in PRICING.items():
+        if model_name in model_lower:
+            return prices
+    return None
+
+
+# Slotted dataclasses need Python 3.10+; older interpreters fall back to __dict__
+_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
 class CommitMessage:
     """Represents a generated commit message."""
 
@@ -16,9 +83,22 @@ class CommitMessage:
     raw: str = ""
     tokens_used: int = 0
     cost: float = 0.0
-    timestamp: datetime = field(default_factory=datetime.now)
+    # Filled in on first access; most messages are printed and discarded unread
+    _timestamp: Optional[datetime] = field(default=None, compare=False)
     provider: str = ""
     model: str = ""
+    # Served from the response cache, so no tokens were spent on it
+    cached: bool = False
+
+    @property
+    def timestamp(self) -> datetime:
+        """Time the message was first timestamped."""
+        timestamp = self._timestamp
+        if timestamp is None:
+            timestamp = datetime.now()
+            # Frozen dataclass, so bypass __setattr__ for the one-time fill-in
+            object.__setattr__(self, "_timestamp", timestamp)
+        return timestamp
 
     def format(self) -> str:
         """Format the commit message."""
@@ -32,37 +112,22 @@ class CommitMessage:
             parts.append("")  # Blank line
             parts.append(self.footer)
 
-        return "\\n".join(parts)
+        return "\n".join(parts)
 
     def validate_conventional(self) -> bool:
         """Validate if message follows Conventional Commits format."""
-        conventional_types = [
-            "feat",
-            "fix",
-            "docs",
-            "style",
-            "refactor",
-            "perf",
-            "test",
-            "build",
-            "ci",
-            "chore",
-            "revert",
-        ]
-
-        # Check if subject starts with a valid type
-        for commit_type in conventional_types:
-            if self.subject.startswith(f"{commit_type}:") or self.subject.startswith(
-                f"{commit_type}("
-            ):
-                return True
-
-        return False
+        return _CONVENTIONAL_RE.match(self.subject) is not None
 
 
 class AIProvider(ABC):
     """Abstract base class for AI providers."""
 
+    model: str
+    # Name recorded on generated messages
+    provider_name: str = ""
+    # Whether trailing "BREAKING CHANGE:"/"Refs:"/"Closes:" lines are split into the footer
+    parse_footer: bool = True
+
     def __init__(self, config: Any):
         """Initialize the provider.
 
@@ -70,6 +135,18 @@ class AIProvider(ABC):
             config: Configuration object
         """
         self.config = config
+        # Bound per instance so a provider can swap in its own prompt templates
+        self._build_prompt: Callable[..., str] = build_commit_prompt_cached
+        self._system_prompt: str = SYSTEM_PROMPT
+        self._cache: Optional[LLMCache] = None
+        self._semantic_cache: Optional[SemanticCache] = None
+
+        if getattr(config, "enable_cache", False):
+            from diff2commit import cache
+
+            self._cache = cache.LLMCache(config.cache_dir)
+            if config.semantic_cache:
+                self._semantic_cache = cache.SemanticCache(self._cache, config.semantic_threshold)
 
     @abstractmethod
     def generate_commit_message(self, diff: str, context: Dict[str, Any]) -> CommitMessage:
@@ -87,6 +164,121 @@ class AIProvider(ABC):
         """
         pass
 
+    @abstractmethod
+    async def agenerate_commit_message(self, diff: str, context: Dict[str, Any]) -> CommitMessage:
+        """Asynchronously generate a commit message from a diff.
+
+        Args:
+            diff: Git diff text
+            context: Additional context (files, stats, etc.)
+
+        Returns:
+            CommitMessage object
+
+        Raises:
+            Exception: If generation fails
+        """
+
+    def stream_commit_message(
+        self, diff: str, context: Dict[str, Any], on_token: Callable[[str], None]
+    ) -> CommitMessage:
+        """Generate a commit message, reporting text as it arrives.
+
+        Providers that support streamed responses override this. The default
+        generates the full message and reports it as a single piece.
+
+        Args:
+            diff: Git diff text
+            context: Additional context (files, stats, etc.)
+            on_token: Callback invoked with each piece of generated text
+
+        Returns:
+            CommitMessage object
+        """
+        message = self.generate_commit_message(diff, context)
+        on_token(message.raw)
+        return message
+
+    async def astream_commit_message(
+        self, diff: str, context: Dict[str, Any], on_token: Callable[[str], None]
+    ) -> CommitMessage:
+        """Async counterpart of :meth:`stream_commit_message`.
+
+        Args:
+            diff: Git diff text
+            context: Additional context (files, stats, etc.)
+            on_token: Callback invoked with each piece of generated text
+
+        Returns:
+            CommitMessage object
+        """
+        message = await self.agenerate_commit_message(diff, context)
+        on_token(message.raw)
+        return message
+
+    async def agenerate_many(
+        self, diffs_and_contexts: Iterable[Tuple[str, Dict[str, Any]]]
+    ) -> List[CommitMessage]:
+        """Generate commit messages for several diffs concurrently.
+
+        At most ``config.max_concurrency`` requests are in flight at once.
+
+        Args:
+            diffs_and_contexts: Pairs of (diff, context)
+
+        Returns:
+            List of CommitMessage objects, in input order
+        """
+        semaphore = asyncio.Semaphore(self.config.max_concurrency)
+
+        async def _bounded(diff: str, context: Dict[str, Any]) -> CommitMessage:
+            async with semaphore:
+                return await self.agenerate_commit_message(diff, context)
+
+        return list(
+            await asyncio.gather(*(_bounded(diff, context) for diff, context in diffs_and_contexts))
+        )
+
+    def generate_candidates(
+        self, diff: str, context: Dict[str, Any], k: int = 3
+    ) -> List[CommitMessage]:
+        """Generate several alternative commit messages for one diff.
+
+        Providers whose API can return multiple completions per request
+        override this to use a single call. The default issues ``k``
+        concurrent requests, so it must not be called from a running event loop.
+
+        Args:
+            diff: Git diff text
+            context: Additional context (files, stats, etc.)
+            k: Number of candidates
+
+        Returns:
+            List of CommitMessage objects
+        """
+        return asyncio.run(self.agenerate_many([(diff, context)] * k))
+
+    async def aclose(self) -> None:
+        """Close the connections held for async requests.
+
+        Async clients are bound to the event loop that first used them, so
+        callers should run all their async requests in one loop and close the
+        provider before that loop ends. The default holds nothing to close.
+        """
+
+    @contextlib.contextmanager
+    def skip_cache(self) -> Iterator[None]:
+        """Bypass the response cache for requests made inside the block.
+
+        Used when asking for another suggestion for a diff already answered,
+        where a cache hit would only repeat the earlier message.
+        """
+        token = _SKIP_CACHE.set(True)
+        try:
+            yield
+        finally:
+            _SKIP_CACHE.reset(token)
+
     @abstractmethod
     def validate_credentials(self) -> bool:
         """Validate API credentials.
@@ -108,6 +300,180 @@ class AIProvider(ABC):
         """
         pass
 
+    def _build_user_prompt(self, diff: str, context: Dict[str, Any]) -> str:
+        """Build the user prompt shared by the sync and async generation paths.
+
+        Args:
+            diff: Git diff text
+            context: Additional context (files, stats, etc.)
+
+        Returns:
+            Formatted prompt string
+        """
+        return self._build_prompt(
+            diff=diff,
+            files_changed=context.get("files_changed", []),
+            additions=context.get("additions", 0),
+            deletions=context.get("deletions", 0),
+            change_types=context.get("change_types", {}),
+            include_emoji=self.config.include_emoji,
+            # ~4 characters per token
+            max_diff_chars=self.config.max_input_tokens * 4,
+            summary=context.get("file_summary"),
+        )
+
+    def _cache_lookup(
+        self, cache: "LLMCache", prompt: str, system: str
+    ) -> Tuple[str, Optional[CommitMessage]]:
+        """Look up a request in the response cache.
+
+        Exact matches are checked first; the semantic layer, when enabled,
+        then catches near-duplicate prompts.
+
+        Args:
+            cache: Exact-match cache
+            prompt: User prompt
+            system: System prompt
+
+        Returns:
+            Tuple of (cache_key, cached_message_or_None); a cached message reports
+            zero tokens and cost and has ``cached`` set
+        """
+        key = cache.make_key(
+            self.__class__.__name__,
+            self.model,
+            system,
+            prompt,
+            self.config.temperature,
+            self.config.max_tokens,
+        )
+        cached = cache.get(key)
+        if cached is None and self._semantic_cache is not None:
+            cached = self._semantic_cache.get(prompt, self._cache_scope())
+        if cached is not None:
+            # The stored usage belongs to the original request; a hit costs nothing
+            cached = replace(cached, tokens_used=0, cost=0.0, cached=True)
+        return key, cached
+
+    def _cache_store(
+        self, cache: "LLMCache", key: str, prompt: str, message: CommitMessage
+    ) -> None:
+        """Store a freshly generated message in the response cache."""
+        cache.put(key, message)
+        if self._semantic_cache is not None:
+            self._semantic_cache.put(prompt, self._cache_scope(), key)
+
+    def _cache_scope(self) -> str:
+        """Scope semantic matches to the same provider and model."""
+        return f"{self.__class__.__name__}|{self.model}"
+
+    def _cached_generate(
+        self, prompt: str, system: str, generator_fn: Callable[[], CommitMessage]
+    ) -> CommitMessage:
+        """Return a cached response for the request, calling the API only on a miss.
+
+        Args:
+            prompt: User prompt
+            system: System prompt
+            generator_fn: Performs the API call
+
+        Returns:
+            CommitMessage object; the cache is neither read nor written inside
+            :meth:`skip_cache`
+        """
+        if self._cache is None or _SKIP_CACHE.get():
+            return generator_fn()
+
+        key, cached = self._cache_lookup(self._cache, prompt, system)
+        if cached is not None:
+            return cached
+
+        message = generator_fn()
+        self._cache_store(self._cache, key, prompt, message)
+        return message
+
+    async def _acached_generate(
+        self, prompt: str, system: str, generator_fn: Callable[[], Awaitable[CommitMessage]]
+    ) -> CommitMessage:
+        """Async counterpart of :meth:`_cached_generate`."""
+        if self._cache is None or _SKIP_CACHE.get():
+            return await generator_fn()
+
+        key, cached = self._cache_lookup(self._cache, prompt, system)
+        if cached is not None:
+            return cached
+
+        message = await generator_fn()
+        self._cache_store(self._cache, key, prompt, message)
+        return message
+
+    def _parse_message(self, text: str, tokens: int, cost: float) -> CommitMessage:
+        """Parse generated message text into subject, body and footer.
+
+        Args:
+            text: Generated message text
+            tokens: Token count
+            cost: Estimated cost
+
+        Returns:
+            CommitMessage object
+        """
+        parse_footer = self.parse_footer
+        subject = ""
+        body_lines = []
+        footer_lines = []
+
+        in_body = False
+        in_footer = False
+
+        for raw_line in text.strip().splitlines():
+            line = raw_line.strip()
+            if not subject and line:
+                # Subject is the first non-empty line
+                subject = line
+            elif parse_footer and (in_footer or line.startswith(_FOOTER_PREFIXES)):
+                in_footer = True
+                footer_lines.append(line)
+            elif line or in_body:
+                in_body = True
+                body_lines.append(raw_line)
+
+        # Drop blank lines between body and footer. The body starts on a non-empty
+        # line and the footer runs to the end of the stripped text, so neither
+        # needs a strip() after joining.
+        while body_lines and not body_lines[-1].strip():
+            body_lines.pop()
+
+        # Truncate subject if too long
+        max_len = self.config.max_subject_length
+        if len(subject) > max_len:
+            subject = subject[: max_len - 3] + "..."
+
+        return CommitMessage(
+            subject=subject,
+            body="\n".join(body_lines) or None,
+            footer="\n".join(footer_lines) or None,
+            raw=text,
+            tokens_used=tokens,
+            cost=cost,
+            provider=self.provider_name,
+            model=self.model,
+        )
+
+    @staticmethod
+    def _split_tokens(total: int, parts: int) -> List[int]:
+        """Split a token count evenly across the messages of one response.
+
+        Args:
+            total: Total tokens reported for the response
+            parts: Number of messages sharing the response
+
+        Returns:
+            Per-message token counts summing to ``total``
+        """
+        share, remainder = divmod(total, parts)
+        return [share + (1 if i < remainder else 0) for i in range(parts)]
+
     def _calculate_cost(self, tokens: int, model: str) -> float:
         """Calculate cost based on token usage.
 
@@ -118,32 +484,19 @@ class AIProvider(ABC):
         Returns:
             Estimated cost in USD
         """
+        model_lower = model.lower()
+
         # Free models have no cost
-        if "free" in model.lower():
+        if "free" in model_lower:
             return 0.0
 
-        # Pricing per 1K tokens (approximate as of 2025)
-        pricing = {
-            # OpenAI
-            "gpt-4": {"input": 0.03, "output": 0.06},
-            "gpt-4-turbo": {"input": 0.01, "output": 0.03},
-            "gpt-3.5-turbo": {"input": 0.0005, "output": 0.0015},
-            # Gemini
-            "gemini-pro": {"input": 0.00025, "output": 0.0005},
-            "gemini-ultra": {"input": 0.001, "output": 0.002},
-            # OpenRouter (non-free models)
-            "qwen": {"input": 0.0, "output": 0.0},  # Free tier
-        }
-
-        # Find matching pricing
-        for model_name, prices in pricing.items():
-            if model_name in model.lower():
-                # Estimate input/output split (rough 70/30)
-                input_tokens = int(tokens * 0.7)
-                output_tokens = int(tokens * 0.3)
-                return (
-                    input_tokens * prices["input"] / 1000 + output_tokens * prices["output"] / 1000
-                )
-
-        # Default estimate
-        return tokens * 0.002 / 1000
+        prices = _lookup_price(model_lower)
+        if prices is None:
+            # Default estimate
+            return tokens * 0.002 / 1000
+
+        # Estimate input/output split (rough 70/30)
+        input_rate, output_rate = prices
+        input_tokens = int(tokens * 0.7)
+        output_tokens = int(tokens * 0.3)
+        return (input_tokens * input_rate + output_tokens * output_rate) / 1000
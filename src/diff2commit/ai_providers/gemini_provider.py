@@ -1,16 +1,22 @@
 """Google Gemini provider implementation."""
 
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, List
+
+import orjson
 import requests
-from tenacity import retry, stop_after_attempt, wait_exponential
+from requests.adapters import HTTPAdapter
 
 from diff2commit.ai_providers.base import AIProvider, CommitMessage
-from diff2commit.prompts import SYSTEM_PROMPT, build_commit_prompt
+from diff2commit.retry import retry_call
 
 
 class GeminiProvider(AIProvider):
     """Google Gemini provider for commit message generation."""
 
+    provider_name = "gemini"
+    parse_footer = False
+
     def __init__(self, config: Any):
         """Initialize Gemini provider."""
         super().__init__(config)
@@ -22,53 +28,114 @@ class GeminiProvider(AIProvider):
         self.model = config.ai_model if "gemini" in config.ai_model else "gemini-pro"
         self.base_url = "https://generativelanguage.googleapis.com/v1beta"
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
+        # Gemini has no system role, so the system prompt is prepended to every request.
+        # Its token estimate is computed once, since the prefix never changes.
+        self._system_prefix = self._system_prompt + "\n\n"
+        self._system_tokens = len(self._system_prefix) // 4
+
+        # Reuse TCP/TLS connections across generation and validation calls
+        self._session = requests.Session()
+        self._session.mount(
+            "https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0)
+        )
+
     def generate_commit_message(self, diff: str, context: Dict[str, Any]) -> CommitMessage:
         """Generate commit message using Gemini."""
-        prompt = build_commit_prompt(
-            diff=diff,
-            files_changed=context.get("files_changed", []),
-            additions=context.get("additions", 0),
-            deletions=context.get("deletions", 0),
-            change_types=context.get("change_types", {}),
-            include_emoji=self.config.include_emoji,
-        )
+        prompt = self._build_user_prompt(diff, context)
+        return self._cached_generate(prompt, self._system_prompt, lambda: self._complete(prompt))
+
+    def generate_candidates(
+        self, diff: str, context: Dict[str, Any], k: int = 3
+    ) -> List[CommitMessage]:
+        """Generate several commit messages in a single request using ``candidateCount``."""
+        prompt = self._build_user_prompt(diff, context)
+        return self._request(prompt, candidate_count=k)
+
+    def _complete(self, prompt: str) -> CommitMessage:
+        """Request a completion for the prompt.
+
+        Args:
+            prompt: User prompt
+
+        Returns:
+            CommitMessage object
+        """
+        return self._request(prompt)[0]
+
+    def _request(self, prompt: str, candidate_count: int = 1) -> List[CommitMessage]:
+        """Call the generateContent endpoint.
 
-        full_prompt = f"{SYSTEM_PROMPT}\\n\\n{prompt}"
+        Args:
+            prompt: User prompt
+            candidate_count: Number of candidates to request
+
+        Returns:
+            List of CommitMessage objects, one per candidate
+        """
+        full_prompt = f"{self._system_prefix}{prompt}"
+
+        generation_config: Dict[str, Any] = {
+            "temperature": self.config.temperature,
+            "maxOutputTokens": self.config.max_tokens,
+        }
+        if candidate_count > 1:
+            generation_config["candidateCount"] = candidate_count
 
         try:
             url = f"{self.base_url}/models/{self.model}:generateContent?key={self.api_key}"
 
-            response = requests.post(
-                url,
-                json={
+            # Encode once up front; retries resend the same bytes
+            body = orjson.dumps(
+                {
                     "contents": [{"parts": [{"text": full_prompt}]}],
-                    "generationConfig": {
-                        "temperature": self.config.temperature,
-                        "maxOutputTokens": self.config.max_tokens,
-                    },
-                },
-                timeout=self.config.timeout,
+                    "generationConfig": generation_config,
+                }
+            )
+            data = retry_call(
+                lambda: self._post(url, body),
+                exceptions=(requests.RequestException,),
+                attempts=self.config.max_retries,
             )
-            response.raise_for_status()
+            messages = []
+            for candidate in data["candidates"]:
+                message_text = candidate["content"]["parts"][0]["text"].strip()
 
-            data = response.json()
-            message_text = data["candidates"][0]["content"]["parts"][0]["text"].strip()
+                # Estimate tokens at ~4 chars each (Gemini doesn't always return usage)
+                tokens = self._system_tokens + (len(prompt) + len(message_text)) // 4
+                cost = self._calculate_cost(tokens, self.model)
 
-            # Estimate tokens (Gemini doesn't always return this)
-            tokens = len(message_text.split()) + len(diff.split())
-            cost = self._calculate_cost(tokens, self.model)
+                messages.append(self._parse_message(message_text, tokens, cost))
 
-            return self._parse_message(message_text, tokens, cost)
+            return messages
 
         except Exception as e:
             raise RuntimeError(f"Gemini API error: {e}") from e
 
+    def _post(self, url: str, body: bytes) -> Dict[str, Any]:
+        """POST a JSON-encoded request body and return the decoded JSON response."""
+        response = self._session.post(
+            url,
+            data=body,
+            headers={"Content-Type": "application/json"},
+            timeout=self.config.timeout,
+        )
+        response.raise_for_status()
+        data: Dict[str, Any] = orjson.loads(response.content)
+        return data
+
+    async def agenerate_commit_message(self, diff: str, context: Dict[str, Any]) -> CommitMessage:
+        """Asynchronously generate commit message using Gemini.
+
+        The REST call is blocking, so it runs in a worker thread to keep the
+        event loop free for other requests.
+        """
+        return await asyncio.to_thread(self.generate_commit_message, diff, context)
+
     def validate_credentials(self) -> bool:
         """Validate Gemini API credentials."""
         try:
             url = f"{self.base_url}/models/{self.model}:generateContent?key={self.api_key}"
-            response = requests.post(
+            response = self._session.post(
                 url, json={"contents": [{"parts": [{"text": "test"}]}]}, timeout=10
             )
             return response.status_code == 200
@@ -83,24 +150,3 @@ class GeminiProvider(AIProvider):
             "max_tokens": self.config.max_tokens,
             "temperature": self.config.temperature,
         }
-
-    def _parse_message(self, text: str, tokens: int, cost: float) -> CommitMessage:
-        """Parse generated message."""
-        lines = text.strip().split("\\n")
-        subject = lines[0].strip() if lines else ""
-
-        body_lines = [line for line in lines[1:] if line.strip()]
-
-        max_len = self.config.max_subject_length
-        if len(subject) > max_len:
-            subject = subject[: max_len - 3] + "..."
-
-        return CommitMessage(
-            subject=subject,
-            body="\\n".join(body_lines).strip() if body_lines else None,
-            raw=text,
-            tokens_used=tokens,
-            cost=cost,
-            provider="gemini",
-            model=self.model,
-        )
@@ -1,17 +1,18 @@
 """OpenAI provider implementation."""
 
-from typing import Dict, Any
-from openai import OpenAI
-from openai import OpenAIError, AuthenticationError, RateLimitError
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+import hashlib
+from typing import Any, Dict, Optional
+from openai import OpenAIError, AuthenticationError
 
-from diff2commit.ai_providers.base import AIProvider, CommitMessage
-from diff2commit.prompts import SYSTEM_PROMPT, build_commit_prompt
+from diff2commit.ai_providers._openai_compat import OpenAICompatibleProvider
 
 
-class OpenAIProvider(AIProvider):
+class OpenAIProvider(OpenAICompatibleProvider):
     """OpenAI GPT provider for commit message generation."""
 
+    provider_name = "openai"
+    api_label = "OpenAI"
+
     def __init__(self, config: Any):
         """Initialize OpenAI provider.
 
@@ -21,69 +22,33 @@ class OpenAIProvider(AIProvider):
         Raises:
             ValueError: If API key is missing
         """
-        super().__init__(config)
-
         if not config.api_key:
             raise ValueError("OpenAI API key is required. Set D2C_API_KEY environment variable.")
 
-        self.client = OpenAI(
-            api_key=config.api_key, base_url=config.api_endpoint, timeout=config.timeout
-        )
-        self.model = config.ai_model
+        super().__init__(config, base_url=config.api_endpoint)
+
+        # Requests sharing a cache key are routed to the same server-side prompt
+        # cache, so the constant system prompt prefix is processed once. Custom
+        # OpenAI-compatible endpoints may reject the unknown parameter.
+        self._prompt_cache_key: Optional[str] = None
+        if not config.api_endpoint:
+            digest = hashlib.sha256(self._system_prompt.encode("utf-8")).hexdigest()
+            self._prompt_cache_key = f"diff2commit-{digest[:16]}"
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type(RateLimitError),
-    )
-    def generate_commit_message(self, diff: str, context: Dict[str, Any]) -> CommitMessage:
-        """Generate commit message using OpenAI.
+    def _request_kwargs(self, prompt: str, n: int = 1) -> Dict[str, Any]:
+        """Build the chat completion request arguments, adding the prompt cache key.
 
         Args:
-            diff: Git diff text
-            context: Additional context
+            prompt: User prompt
+            n: Number of completions to request
 
         Returns:
-            CommitMessage object
+            Keyword arguments for ``chat.completions.create``
         """
-        # Build prompt
-        prompt = build_commit_prompt(
-            diff=diff,
-            files_changed=context.get("files_changed", []),
-            additions=context.get("additions", 0),
-            deletions=context.get("deletions", 0),
-            change_types=context.get("change_types", {}),
-            include_emoji=self.config.include_emoji,
-        )
-
-        try:
-            # Call OpenAI API
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": prompt},
-                ],
-                max_tokens=self.config.max_tokens,
-                temperature=self.config.temperature,
-            )
-
-            # Extract message with None check
-            content = response.choices[0].message.content
-            if content is None:
-                raise RuntimeError("OpenAI returned empty content")
-
-            message_text = content.strip()
-            tokens = response.usage.total_tokens if response.usage else 0
-            cost = self._calculate_cost(tokens, self.model)
-
-            # Parse message
-            return self._parse_message(message_text, tokens, cost)
-
-        except AuthenticationError as e:
-            raise ValueError(f"Invalid OpenAI API key: {e}") from e
-        except OpenAIError as e:
-            raise RuntimeError(f"OpenAI API error: {e}") from e
+        kwargs = super()._request_kwargs(prompt, n=n)
+        if self._prompt_cache_key:
+            kwargs["prompt_cache_key"] = self._prompt_cache_key
+        return kwargs
 
     def validate_credentials(self) -> bool:
         """Validate OpenAI API credentials.
@@ -112,54 +77,3 @@ class OpenAIProvider(AIProvider):
             "max_tokens": self.config.max_tokens,
             "temperature": self.config.temperature,
         }
-
-    def _parse_message(self, text: str, tokens: int, cost: float) -> CommitMessage:
-        """Parse the generated message text.
-
-        Args:
-            text: Generated message text
-            tokens: Token count
-            cost: Estimated cost
-
-        Returns:
-            CommitMessage object
-        """
-        lines = text.strip().split("\\n")
-
-        # Extract subject (first non-empty line)
-        subject = ""
-        body_lines = []
-        footer_lines = []
-
-        in_body = False
-        in_footer = False
-
-        for line in lines:
-            if not subject and line.strip():
-                subject = line.strip()
-            elif not in_footer and line.strip().startswith(
-                ("BREAKING CHANGE:", "Refs:", "Closes:")
-            ):
-                in_footer = True
-                footer_lines.append(line.strip())
-            elif in_footer:
-                footer_lines.append(line.strip())
-            elif line.strip() or in_body:
-                in_body = True
-                body_lines.append(line)
-
-        # Truncate subject if too long
-        max_len = self.config.max_subject_length
-        if len(subject) > max_len:
-            subject = subject[: max_len - 3] + "..."
-
-        return CommitMessage(
-            subject=subject,
-            body="\\n".join(body_lines).strip() if body_lines else None,
-            footer="\\n".join(footer_lines).strip() if footer_lines else None,
-            raw=text,
-            tokens_used=tokens,
-            cost=cost,
-            provider="openai",
-            model=self.model,
-        )
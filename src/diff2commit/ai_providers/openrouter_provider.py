@@ -1,37 +1,41 @@
 """OpenRouter provider implementation."""
 
-from typing import Any, Dict
+import time
+from typing import Any, Dict, Optional
 
-from openai import AuthenticationError, OpenAI, OpenAIError, RateLimitError
-from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
-from diff2commit.ai_providers.base import AIProvider, CommitMessage
-from diff2commit.prompts import SYSTEM_PROMPT, build_commit_prompt
+from openai import AuthenticationError, OpenAIError
 
+from diff2commit.ai_providers._openai_compat import OpenAICompatibleProvider
 
-class OpenRouterProvider(AIProvider):
+# Rate-limit resets further away than the longest retry backoff will not clear in time
+_MAX_RATE_LIMIT_WAIT = 10.0
+
+
+class OpenRouterProvider(OpenAICompatibleProvider):
     """OpenRouter provider for commit message generation"""
 
-    # Default free API key provided by the CLI
-    DEFAULT_FREE_API_KEY = (
-        "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"
-    )
+    provider_name = "openrouter"
+    api_label = "OpenRouter"
 
     def __init__(self, config: Any):
         """Initialize OpenRouter provider.
 
         Args:
             config: Configuration object
-        """
-        super().__init__(config)
 
-        # Use default free API key if none provided
-        api_key = config.api_key or self.DEFAULT_FREE_API_KEY
+        Raises:
+            ValueError: If API key is missing
+        """
+        if not config.api_key:
+            raise ValueError(
+                "OpenRouter API key is required. Create a free key at "
+                "https://openrouter.ai/keys and set the D2C_API_KEY environment variable."
+            )
 
         # OpenRouter uses OpenAI-compatible API
-        self.client = OpenAI(
+        super().__init__(
+            config,
             base_url="https://openrouter.ai/api/v1",
-            api_key=api_key,
-            timeout=config.timeout,
             default_headers={
                 "HTTP-Referer": "https://github.com/maadhav-codes/diff2commit",
                 "X-Title": "diff2commit",
@@ -39,64 +43,55 @@ class OpenRouterProvider(AIProvider):
         )
 
         # Use Qwen free model by default
-        self.model = config.ai_model
         self.is_free_tier = "free" in self.model.lower()
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type(RateLimitError),
-    )
-    def generate_commit_message(self, diff: str, context: Dict[str, Any]) -> CommitMessage:
-        """Generate commit message using OpenRouter.
+        # Epoch seconds at which the last reported rate-limit window resets
+        self._rate_limit_reset: Optional[float] = None
+
+    def _rate_limit_exhausted(self, error: BaseException) -> bool:
+        """Record the rate-limit reset time and decide whether retrying is pointless.
 
         Args:
-            diff: Git diff text
-            context: Additional context
+            error: Rate-limit error raised by the SDK
 
         Returns:
-            CommitMessage object
+            True if the limit resets later than a retry would wait
         """
-        # Build prompt
-        prompt = build_commit_prompt(
-            diff=diff,
-            files_changed=context.get("files_changed", []),
-            additions=context.get("additions", 0),
-            deletions=context.get("deletions", 0),
-            change_types=context.get("change_types", {}),
-            include_emoji=self.config.include_emoji,
-        )
+        response = getattr(error, "response", None)
+        reset = response.headers.get("x-ratelimit-reset") if response is not None else None
+        if reset is None:
+            return False
 
         try:
-            # Call OpenRouter API (OpenAI-compatible)
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": prompt},
-                ],
-                max_tokens=self.config.max_tokens,
-                temperature=self.config.temperature,
-            )
+            # OpenRouter reports the reset as milliseconds since the epoch
+            self._rate_limit_reset = float(reset) / 1000
+        except ValueError:
+            return False
+        return self._rate_limit_reset - time.time() > _MAX_RATE_LIMIT_WAIT
+
+    def _check_rate_limit(self) -> None:
+        """Fail fast while a previously reported rate limit is still in effect.
 
-            # Extract message
-            message_content = response.choices[0].message.content
-            if message_content is None:
-                raise ValueError("OpenRouter API returned empty response")
-            message_text = message_content.strip()
+        Raises:
+            RuntimeError: If the rate limit will not reset within the retry window
+        """
+        if self._rate_limit_reset is None:
+            return
 
-            tokens = response.usage.total_tokens if response.usage else 0
+        wait = self._rate_limit_reset - time.time()
+        if wait > _MAX_RATE_LIMIT_WAIT:
+            raise RuntimeError(f"OpenRouter rate limit reached; resets in {wait:.0f}s")
 
-            # Free tier has no cost
-            cost = 0.0 if self.is_free_tier else self._calculate_cost(tokens, self.model)
+    def _message_cost(self, tokens: int) -> float:
+        """Estimate the cost of a message; free-tier models cost nothing.
 
-            # Parse message
-            return self._parse_message(message_text, tokens, cost)
+        Args:
+            tokens: Tokens attributed to the message
 
-        except AuthenticationError as e:
-            raise ValueError(f"Invalid OpenRouter API key: {e}") from e
-        except OpenAIError as e:
-            raise RuntimeError(f"OpenRouter API error: {e}") from e
+        Returns:
+            Estimated cost in USD
+        """
+        return 0.0 if self.is_free_tier else self._calculate_cost(tokens, self.model)
 
     def validate_credentials(self) -> bool:
         """Validate OpenRouter API credentials.
@@ -129,54 +124,3 @@ class OpenRouterProvider(AIProvider):
             "free_tier": self.is_free_tier,
             "cost": "Free" if self.is_free_tier else "Paid",
         }
-
-    def _parse_message(self, text: str, tokens: int, cost: float) -> CommitMessage:
-        """Parse the generated message text.
-
-        Args:
-            text: Generated message text
-            tokens: Token count
-            cost: Estimated cost
-
-        Returns:
-            CommitMessage object
-        """
-        lines = text.strip().split("\\n")
-
-        # Extract subject (first non-empty line)
-        subject = ""
-        body_lines = []
-        footer_lines = []
-
-        in_body = False
-        in_footer = False
-
-        for line in lines:
-            if not subject and line.strip():
-                subject = line.strip()
-            elif not in_footer and line.strip().startswith(
-                ("BREAKING CHANGE:", "Refs:", "Closes:")
-            ):
-                in_footer = True
-                footer_lines.append(line.strip())
-            elif in_footer:
-                footer_lines.append(line.strip())
-            elif line.strip() or in_body:
-                in_body = True
-                body_lines.append(line)
-
-        # Truncate subject if too long
-        max_len = self.config.max_subject_length
-        if len(subject) > max_len:
-            subject = subject[: max_len - 3] + "..."
-
-        return CommitMessage(
-            subject=subject,
-            body="\\n".join(body_lines).strip() if body_lines else None,
-            footer="\\n".join(footer_lines).strip() if footer_lines else None,
-            raw=text,
-            tokens_used=tokens,
-            cost=cost,
-            provider="openrouter",
-            model=self.model,
-        )
@@ -0,0 +1,199 @@
+"""Client-side rate limiting for AI providers."""
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from diff2commit.ai_providers.base import AIProvider, CommitMessage
+
+# Default (requests per minute, tokens per minute, max concurrent requests) per provider.
+# Conservative entry-tier limits so bursts throttle themselves before the server returns 429.
+PROVIDER_PROFILES: Dict[str, Tuple[int, int, int]] = {
+    "openrouter": (20, 100_000, 4),
+    "openai": (60, 150_000, 10),
+    "gemini": (60, 100_000, 8),
+}
+
+
+class AsyncRateLimiter:
+    """Leaky-bucket limiter allowing ``max_rate`` units per ``period`` seconds."""
+
+    def __init__(self, max_rate: float, period: float = 60.0):
+        """Initialize the limiter.
+
+        Args:
+            max_rate: Units allowed per period
+            period: Period length in seconds
+        """
+        self.max_rate = max_rate
+        self.period = period
+        self._level = 0.0
+        self._last = time.monotonic()
+
+    def _leak(self) -> None:
+        """Drain the bucket for the time elapsed since the last update."""
+        now = time.monotonic()
+        self._level = max(0.0, self._level - (now - self._last) * self.max_rate / self.period)
+        self._last = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """Wait until ``amount`` units fit in the bucket, then take them.
+
+        An empty bucket always admits the request, so amounts larger than
+        ``max_rate`` cannot block forever.
+
+        Args:
+            amount: Units to take
+        """
+        while True:
+            self._leak()
+            if self._level + amount <= self.max_rate or self._level == 0:
+                self._level += amount
+                return
+            overflow = self._level + amount - self.max_rate
+            await asyncio.sleep(overflow * self.period / self.max_rate)
+
+    def debit(self, amount: float) -> None:
+        """Record units that were used without waiting, such as tokens reported afterwards.
+
+        Args:
+            amount: Units used
+        """
+        self._leak()
+        self._level += amount
+
+
+class RateLimitedProvider(AIProvider):
+    """Wrap a provider so async requests respect per-minute request and token limits.
+
+    Synchronous calls are passed straight through, since they are issued one
+    at a time.
+    """
+
+    def __init__(self, inner: AIProvider, rpm: int, tpm: int, max_concurrent: int):
+        """Initialize the wrapper.
+
+        Args:
+            inner: Provider that performs the requests
+            rpm: Requests allowed per minute
+            tpm: Tokens allowed per minute
+            max_concurrent: Maximum requests in flight at once
+        """
+        # Share the inner provider's state rather than building a second cache
+        self.inner = inner
+        self.config = inner.config
+        self.model = inner.model
+        self.provider_name = inner.provider_name
+        self.max_concurrent = max_concurrent
+        self._requests = AsyncRateLimiter(rpm)
+        self._tokens = AsyncRateLimiter(tpm)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def __getattr__(self, name: str) -> Any:
+        """Fall back to the wrapped provider for attributes the wrapper does not set.
+
+        ``AIProvider.__init__`` is skipped so the cache is not built twice, which
+        leaves the state its helpers read (``_cache``, ``_build_prompt``,
+        ``_system_prompt``, ...) on the inner provider only.
+        """
+        # Guard against recursion while ``inner`` itself is not set yet
+        if name == "inner":
+            raise AttributeError(name)
+        return getattr(self.inner, name)
+
+    def generate_commit_message(self, diff: str, context: Dict[str, Any]) -> CommitMessage:
+        """Generate a commit message with the wrapped provider."""
+        return self.inner.generate_commit_message(diff, context)
+
+    def stream_commit_message(
+        self, diff: str, context: Dict[str, Any], on_token: Callable[[str], None]
+    ) -> CommitMessage:
+        """Stream a commit message with the wrapped provider."""
+        return self.inner.stream_commit_message(diff, context, on_token)
+
+    def generate_candidates(
+        self, diff: str, context: Dict[str, Any], k: int = 3
+    ) -> List[CommitMessage]:
+        """Generate candidates with the wrapped provider's single-request path."""
+        return self.inner.generate_candidates(diff, context, k)
+
+    async def agenerate_commit_message(self, diff: str, context: Dict[str, Any]) -> CommitMessage:
+        """Generate a commit message once the request and token budgets allow it.
+
+        Args:
+            diff: Git diff text
+            context: Additional context
+
+        Returns:
+            CommitMessage object
+        """
+        async with self._get_semaphore():
+            await self._requests.acquire()
+            # Token usage is only known afterwards, so wait for the budget to drain instead
+            await self._tokens.acquire(0)
+            message = await self.inner.agenerate_commit_message(diff, context)
+            self._tokens.debit(message.tokens_used)
+            return message
+
+    async def astream_commit_message(
+        self, diff: str, context: Dict[str, Any], on_token: Callable[[str], None]
+    ) -> CommitMessage:
+        """Stream a commit message once the request and token budgets allow it.
+
+        Args:
+            diff: Git diff text
+            context: Additional context
+            on_token: Callback invoked with each piece of generated text
+
+        Returns:
+            CommitMessage object
+        """
+        async with self._get_semaphore():
+            await self._requests.acquire()
+            await self._tokens.acquire(0)
+            message = await self.inner.astream_commit_message(diff, context, on_token)
+            self._tokens.debit(message.tokens_used)
+            return message
+
+    async def aclose(self) -> None:
+        """Close the wrapped provider's async connections."""
+        await self.inner.aclose()
+
+    def validate_credentials(self) -> bool:
+        """Validate credentials of the wrapped provider."""
+        return self.inner.validate_credentials()
+
+    def get_model_info(self) -> Dict[str, Any]:
+        """Get model information from the wrapped provider."""
+        return self.inner.get_model_info()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the concurrency semaphore for the running event loop.
+
+        Each ``asyncio.run`` call starts a new loop, and a semaphore must not
+        be shared between loops.
+        """
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+
+def with_rate_limits(provider: AIProvider, profile: str) -> AIProvider:
+    """Wrap a provider with the rate limits of a known service profile.
+
+    Args:
+        provider: Provider to wrap
+        profile: Key into ``PROVIDER_PROFILES``
+
+    Returns:
+        Rate-limited provider, or the original provider for unknown profiles
+    """
+    limits = PROVIDER_PROFILES.get(profile)
+    if limits is None:
+        return provider
+
+    rpm, tpm, max_concurrent = limits
+    return RateLimitedProvider(provider, rpm, tpm, max_concurrent)
@@ -0,0 +1,212 @@
+"""On-disk cache for generated commit messages."""
+
+import base64
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+from diff2commit.ai_providers.base import CommitMessage
+from diff2commit.exceptions import ConfigurationError
+
+
+class LLMCache:
+    """Content-addressed cache of LLM responses stored as JSON files."""
+
+    def __init__(self, cache_dir: Path):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cached responses
+        """
+        self.cache_dir = Path(cache_dir)
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Build a cache key from the request parameters.
+
+        Args:
+            parts: Values that uniquely identify a request
+
+        Returns:
+            SHA-256 hex digest of the joined parts
+        """
+        return hashlib.sha256("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[CommitMessage]:
+        """Look up a cached commit message.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached CommitMessage or None on a miss
+        """
+        try:
+            data = json.loads(self._path(key).read_text(encoding="utf-8"))
+            data["_timestamp"] = datetime.fromisoformat(data["_timestamp"])
+            return CommitMessage(**data)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def put(self, key: str, message: CommitMessage) -> None:
+        """Store a commit message in the cache.
+
+        The file is written to a temporary name and renamed into place so
+        concurrent invocations never observe a partial entry.
+
+        Args:
+            key: Cache key
+            message: Commit message to store
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                data = asdict(message)
+                data["_timestamp"] = message.timestamp.isoformat()
+                json.dump(data, f)
+            os.replace(tmp_name, self._path(key))
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def _path(self, key: str) -> Path:
+        """Get the file path for a cache key."""
+        return self.cache_dir / f"{key}.json"
+
+
+class SemanticCache:
+    """Embedding-similarity layer over :class:`LLMCache` for near-duplicate prompts.
+
+    Each indexed prompt is one line of ``semantic_index.jsonl`` next to the
+    cached responses, holding its embedding together with its exact-match key
+    and scope. Requires the optional ``semantic`` extra (``fastembed`` and ``numpy``).
+    """
+
+    MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+    MAX_CHARS = 8192
+
+    def __init__(self, exact_cache: LLMCache, threshold: float = 0.92, embedding_model: Any = None):
+        """Initialize the semantic cache.
+
+        Args:
+            exact_cache: Cache holding the actual responses
+            threshold: Minimum cosine similarity for a hit
+            embedding_model: Object with fastembed's ``embed(texts)`` interface;
+                defaults to ``TextEmbedding(MODEL_NAME)``
+
+        Raises:
+            ConfigurationError: If the optional dependencies are missing
+        """
+        try:
+            import numpy  # noqa: F401
+
+            if embedding_model is None:
+                from fastembed import TextEmbedding
+
+                embedding_model = TextEmbedding(self.MODEL_NAME)
+        except ImportError as e:
+            raise ConfigurationError(
+                "Semantic caching requires extra packages. "
+                "Install them with: pip install 'diff2commit[semantic]'"
+            ) from e
+
+        self.exact_cache = exact_cache
+        self.threshold = threshold
+        self.index_path = exact_cache.cache_dir / "semantic_index.jsonl"
+        self._model = embedding_model
+        self._last_embedding: Optional[Tuple[str, Any]] = None
+
+    def get(self, text: str, scope: str) -> Optional[CommitMessage]:
+        """Find a cached message for a similar prompt.
+
+        Args:
+            text: Prompt text
+            scope: Provider/model scope that a match must share
+
+        Returns:
+            Cached CommitMessage or None if nothing is similar enough
+        """
+        import numpy as np
+
+        entries = [
+            (key, vector)
+            for key, entry_scope, vector in self._load_entries()
+            if entry_scope == scope
+        ]
+        if not entries:
+            return None
+
+        query = self._embed(text)
+        # Vectors from another embedding model, or cut short by a failed write, cannot be compared
+        entries = [(key, vector) for key, vector in entries if len(vector) == query.nbytes]
+        if not entries:
+            return None
+
+        matrix = np.frombuffer(b"".join(vector for _, vector in entries), dtype=np.float32)
+        matrix = matrix.reshape(len(entries), -1)
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+        sims = (matrix @ query) / np.maximum(norms, 1e-12)
+
+        best = int(np.argmax(sims))
+        if sims[best] < self.threshold:
+            return None
+        return self.exact_cache.get(entries[best][0])
+
+    def put(self, text: str, scope: str, key: str) -> None:
+        """Index a prompt so similar prompts can reuse its response.
+
+        The entry is appended with a single write, so concurrent invocations
+        never pair one prompt's embedding with another prompt's key.
+
+        Args:
+            text: Prompt text
+            scope: Provider/model scope
+            key: Exact-match cache key of the stored response
+        """
+        vector = base64.b64encode(self._embed(text).tobytes()).decode("ascii")
+        line = json.dumps({"key": key, "scope": scope, "vector": vector}) + "\n"
+
+        self.exact_cache.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.index_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode("utf-8"))
+        finally:
+            os.close(fd)
+
+    def _embed(self, text: str) -> Any:
+        """Embed a prompt, reusing the previous result for the same text."""
+        text = text[: self.MAX_CHARS]
+        if self._last_embedding is not None and self._last_embedding[0] == text:
+            return self._last_embedding[1]
+
+        import numpy as np
+
+        embedding = np.asarray(next(iter(self._model.embed([text]))), dtype=np.float32)
+        self._last_embedding = (text, embedding)
+        return embedding
+
+    def _load_entries(self) -> List[Tuple[str, str, bytes]]:
+        """Load the indexed entries, skipping lines that cannot be parsed.
+
+        Returns:
+            List of (key, scope, raw float32 embedding) tuples
+        """
+        entries = []
+        try:
+            with self.index_path.open(encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        vector = base64.b64decode(entry["vector"], validate=True)
+                        entries.append((entry["key"], entry["scope"], vector))
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except OSError:
+            return []
+        return entries
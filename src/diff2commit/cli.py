@@ -1,30 +1,48 @@
 """Main CLI application."""
 
-from typing import Dict, Literal, Optional, Type
+import asyncio
+import contextlib
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ContextManager,
+    Coroutine,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    TypeVar,
+    Union,
+)
 
 import typer
 
-from diff2commit.ai_providers.base import AIProvider
-from diff2commit.ai_providers.gemini_provider import GeminiProvider
-from diff2commit.ai_providers.openai_provider import OpenAIProvider
-from diff2commit.ai_providers.openrouter_provider import OpenRouterProvider
+from diff2commit import ai_providers
+from diff2commit.ai_providers.base import AIProvider, CommitMessage
+from diff2commit.ai_providers.rate_limit import with_rate_limits
 from diff2commit.config import Diff2CommitConfig, load_config
-from diff2commit.git_operations import GitOperations
+from diff2commit.summaries import build_file_summary
 from diff2commit.ui.console import (
     create_progress,
     display_commit_message,
     display_diff_summary,
+    display_provider_usage,
+    display_settings,
+    display_usage_stats,
     print_error,
     print_info,
     print_warning,
     print_success,
     console,
 )
-from diff2commit.ui.interactive import InteractiveEditor
 from diff2commit.usage_tracker import UsageTracker
 
 from diff2commit.__version__ import __version__
 
+if TYPE_CHECKING:
+    from rich.progress import Progress
+
 app = typer.Typer(
     name="diff2commit",
     help="CLI tool that automatically generates clear, descriptive commit messages from staged Git diffs using AI",
@@ -34,23 +52,73 @@ app = typer.Typer(
 
 ProviderType = Literal["openrouter", "openai", "gemini"]
 
+T = TypeVar("T")
+
+
+# Provider name -> class name; classes are imported on demand so that commands
+# such as ``version`` and ``config`` never load a provider SDK
+PROVIDER_CLASSES: Dict[str, str] = {
+    "openrouter": "OpenRouterProvider",
+    "openai": "OpenAIProvider",
+    "gemini": "GeminiProvider",
+}
+
 
 def get_provider(config: Diff2CommitConfig) -> AIProvider:
     """Get the appropriate AI provider based on configuration."""
-    providers: Dict[str, Type[AIProvider]] = {
-        "openrouter": OpenRouterProvider,
-        "openai": OpenAIProvider,
-        "gemini": GeminiProvider,
-    }
-
-    provider_class = providers.get(config.ai_provider)
-    if not provider_class:
+    class_name = PROVIDER_CLASSES.get(config.ai_provider)
+    if not class_name:
         raise ValueError(
             f"Unknown provider: {config.ai_provider}. "
             f"Supported: openrouter (free), openai, gemini"
         )
 
-    return provider_class(config)
+    provider_class = getattr(ai_providers, class_name)
+    return with_rate_limits(provider_class(config), config.ai_provider)
+
+
+def _run_async(main: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on uvloop when the optional ``speedups`` extra is installed.
+
+    Args:
+        main: Coroutine to run
+
+    Returns:
+        Result of the coroutine
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(main)
+
+    result: T = uvloop.run(main)
+    return result
+
+
+async def _astream_live(
+    ai_provider: AIProvider, diff: str, context: Dict[str, Any]
+) -> CommitMessage:
+    """Stream a commit message into a live-updating Markdown view.
+
+    Args:
+        ai_provider: Provider generating the message
+        diff: Git diff text
+        context: Additional context
+
+    Returns:
+        CommitMessage object
+    """
+    from rich.live import Live
+    from rich.markdown import Markdown
+
+    pieces: List[str] = []
+    with Live(Markdown(""), console=console, vertical_overflow="visible") as live:
+
+        def on_token(piece: str) -> None:
+            pieces.append(piece)
+            live.update(Markdown("".join(pieces)))
+
+        return await ai_provider.astream_commit_message(diff, context, on_token)
 
 
 @app.command()
@@ -66,41 +134,57 @@ def generate(
     ),
     model: Optional[str] = typer.Option(None, "--model", "-m", help="Override AI model"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
+    quiet: bool = typer.Option(
+        False, "--quiet", "-q", help="Skip the staged changes table, spinner and message panel"
+    ),
     no_commit: bool = typer.Option(
         False, "--no-commit", help="Generate message without committing"
     ),
+    stream: bool = typer.Option(False, "--stream", help="Print messages as they are generated"),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Call the AI provider even if a cached message exists"
+    ),
 ) -> None:
     """Generate and commit with AI-powered message."""
     try:
         # Load configuration
         config = load_config()
 
-        # Override config with CLI options
+        # Override config with CLI options; the loaded config is cached and frozen
+        overrides: Dict[str, Any] = {}
         if provider:
-            config.ai_provider = provider
+            overrides["ai_provider"] = provider
 
-            # Warn if using paid provider without API key
-            if provider in ["openai", "gemini"] and not config.api_key:
+            # Every provider needs an API key
+            if not config.api_key:
                 print_warning(
                     f"Using {provider} requires an API key. "
                     f"Set D2C_API_KEY environment variable."
                 )
-                print_info("Tip: Use default 'openrouter' provider for FREE usage!")
+                print_info("Tip: OpenRouter offers FREE models with a free key from openrouter.ai")
                 raise typer.Exit(1)
 
         if model:
-            config.ai_model = model
+            overrides["ai_model"] = model
         if verbose:
-            config.verbose = verbose
+            overrides["verbose"] = verbose
+        if quiet:
+            overrides["quiet"] = quiet
+        if no_cache:
+            overrides["enable_cache"] = False
+        if overrides:
+            config = config.model_copy(update=overrides)
 
         # Show provider info
         if config.verbose or config.ai_provider != "openrouter":
             if config.ai_provider == "openrouter" and "free" in config.ai_model.lower():
-                console.print("[dim]Using FREE OpenRouter Qwen model (no API key needed)[/dim]")
+                console.print("[dim]Using FREE OpenRouter Qwen model[/dim]")
             else:
                 console.print(f"[dim]Using {config.ai_provider} with {config.ai_model}[/dim]")
 
         # Initialize Git operations
+        from diff2commit.git_operations import GitOperations
+
         try:
             git_ops = GitOperations()
         except Exception as e:
@@ -121,74 +205,147 @@ def generate(
         # Get diff summary
         diff_summary = git_ops.get_staged_diff()
 
-        # Display diff summary
-        display_diff_summary(
+        if diff_summary.truncated and config.verbose:
+            print_info(
+                f"Diff is larger than {git_ops.max_diff_bytes:,} bytes; "
+                "only the first part is sent to the model"
+            )
+
+        # Display diff summary; the rendered file lines are reused in the prompt
+        file_summary = build_file_summary(
             diff_summary.files_changed,
-            diff_summary.additions,
-            diff_summary.deletions,
             diff_summary.change_types,
+            statuses=diff_summary.statuses,
         )
+        if not config.quiet:
+            display_diff_summary(
+                diff_summary.files_changed,
+                diff_summary.additions,
+                diff_summary.deletions,
+                diff_summary.change_types,
+                summary=file_summary,
+            )
 
         # Initialize AI provider
         try:
             ai_provider = get_provider(config)
         except ValueError as e:
             print_error(str(e))
-            if config.ai_provider != "openrouter":
-                print_info("Set your API key: export D2C_API_KEY='your-key-here'")
-                print_info("Or use the FREE default: diff2commit generate --provider openrouter")
+            print_info("Set your API key: export D2C_API_KEY='your-key-here'")
+            if config.ai_provider == "openrouter":
+                print_info("Get a free OpenRouter key at https://openrouter.ai/keys")
             raise typer.Exit(1)
 
         # Generate commit messages
-        messages = []
         usage_tracker = UsageTracker() if config.track_usage else None
+        context = {
+            "files_changed": diff_summary.files_changed,
+            "additions": diff_summary.additions,
+            "deletions": diff_summary.deletions,
+            "change_types": diff_summary.change_types,
+            "file_summary": file_summary,
+        }
+        results: List[Optional[CommitMessage]] = [None] * count
+
+        # Streamed text is printed directly, which would fight with a progress spinner
+        progress_cm: ContextManager[Optional[Progress]] = (
+            contextlib.nullcontext() if stream or config.quiet else create_progress()
+        )
+        # Usage rows are written in one transaction once generation finishes,
+        # then the tracker's connection is closed
+        tracker_cm: ContextManager[Optional[UsageTracker]] = (
+            usage_tracker if usage_tracker else contextlib.nullcontext()
+        )
+        batch_cm: ContextManager[None] = (
+            usage_tracker.batch() if usage_tracker else contextlib.nullcontext()
+        )
+        with progress_cm as progress, tracker_cm, batch_cm:
+            task = (
+                progress.add_task(f"[cyan]Generating {count} commit message(s)...", total=count)
+                if progress
+                else None
+            )
 
-        with create_progress() as progress:
-            task = progress.add_task(f"[cyan]Generating {count} commit message(s)...", total=count)
-
-            for i in range(count):
-                try:
-                    context = {
-                        "files_changed": diff_summary.files_changed,
-                        "additions": diff_summary.additions,
-                        "deletions": diff_summary.deletions,
-                        "change_types": diff_summary.change_types,
-                    }
-
-                    commit_msg = ai_provider.generate_commit_message(
-                        diff_summary.diff_text, context
-                    )
-
-                    messages.append(commit_msg.format())
-
-                    # Track usage
+            def handle_result(i: int, result: Union[CommitMessage, Exception]) -> None:
+                if isinstance(result, Exception):
+                    print_error(f"Failed to generate message {i+1}: {result}")
                     if usage_tracker:
                         usage_tracker.record_usage(
-                            provider=commit_msg.provider,
-                            model=commit_msg.model,
-                            tokens=commit_msg.tokens_used,
-                            cost=commit_msg.cost,
+                            provider=config.ai_provider,
+                            model=config.ai_model,
+                            tokens=0,
+                            cost=0,
+                            success=False,
+                        )
+                else:
+                    results[i] = result
+
+                    # Track usage; cache hits made no API request
+                    if usage_tracker and not result.cached:
+                        usage_tracker.record_usage(
+                            provider=result.provider,
+                            model=result.model,
+                            tokens=result.tokens_used,
+                            cost=result.cost,
                             success=True,
                         )
 
-                    if config.verbose:
-                        cost_str = "FREE" if commit_msg.cost == 0 else f"${commit_msg.cost:.4f}"
+                    if config.verbose and result.cached:
+                        print_info(f"Generated message {i+1}: served from cache")
+                    elif config.verbose:
+                        cost_str = "FREE" if result.cost == 0 else f"${result.cost:.4f}"
                         print_info(
-                            f"Generated message {i+1}: {commit_msg.tokens_used} tokens, {cost_str}"
+                            f"Generated message {i+1}: {result.tokens_used} tokens, {cost_str}"
                         )
 
+                if progress and task is not None:
+                    progress.update(task, advance=1)
+
+            @contextlib.contextmanager
+            def reporting_failure(i: int) -> Iterator[None]:
+                # Report a failed generation as message i instead of aborting the others
+                try:
+                    yield
                 except Exception as e:
-                    print_error(f"Failed to generate message {i+1}: {e}")
-                    if usage_tracker:
-                        usage_tracker.record_usage(
-                            provider=config.ai_provider,
-                            model=config.ai_model,
-                            tokens=0,
-                            cost=0,
-                            success=False,
+                    handle_result(i, e)
+
+            if stream:
+
+                async def stream_all() -> None:
+                    # One event loop for every message keeps the async client's
+                    # connections alive between requests
+                    try:
+                        for i in range(count):
+                            console.print(f"\n[dim]Message {i+1}:[/dim]")
+                            # Later suggestions must differ from the first, so skip the cache
+                            cache_cm: ContextManager[None] = (
+                                ai_provider.skip_cache() if i else contextlib.nullcontext()
+                            )
+                            with reporting_failure(i), cache_cm:
+                                result = await _astream_live(
+                                    ai_provider, diff_summary.diff_text, context
+                                )
+                                handle_result(i, result)
+                    finally:
+                        await ai_provider.aclose()
+
+                _run_async(stream_all())
+            else:
+                # Providers return all suggestions from a single request where the API allows it
+                batch: List[CommitMessage] = []
+                with reporting_failure(0):
+                    if count == 1:
+                        batch = [
+                            ai_provider.generate_commit_message(diff_summary.diff_text, context)
+                        ]
+                    else:
+                        batch = ai_provider.generate_candidates(
+                            diff_summary.diff_text, context, k=count
                         )
+                for i, commit_msg in enumerate(batch):
+                    handle_result(i, commit_msg)
 
-                progress.update(task, advance=1)
+        messages = [commit_msg.format() for commit_msg in results if commit_msg is not None]
 
         if not messages:
             print_error("Failed to generate any commit messages.")
@@ -196,6 +353,8 @@ def generate(
 
         # Review and edit (if enabled)
         if review:
+            from diff2commit.ui.interactive import InteractiveEditor
+
             editor = InteractiveEditor()
             final_message = editor.review_and_edit(messages)
 
@@ -204,7 +363,8 @@ def generate(
                 raise typer.Exit(0)
         else:
             final_message = messages[0]
-            display_commit_message(final_message)
+            if not config.quiet:
+                display_commit_message(final_message)
 
         # Commit or just display
         if no_commit:
@@ -245,34 +405,38 @@ def usage(
 ) -> None:
     """Display token usage and cost statistics."""
     try:
-        tracker = UsageTracker()
+        with UsageTracker() as tracker:
+            if monthly:
+                stats = tracker.get_monthly_usage()
+            elif by_provider:
+                providers = tracker.get_usage_by_provider()
+            else:
+                total = tracker.get_total_usage()
 
         if monthly:
-            stats = tracker.get_monthly_usage()
-            console.print(f"\n[bold]📊 Usage for {stats['month']}[/bold]\n")
-            console.print(f"  Requests: {stats['requests']}")
-            console.print(f"  Tokens: {stats['tokens']:,}")
-            console.print(f"  Cost: ${stats['cost']:.4f}\n")
+            display_usage_stats(
+                {
+                    "Requests": stats["requests"],
+                    "Tokens": f"{stats['tokens']:,}",
+                    "Cost": f"${stats['cost']:.4f}",
+                },
+                title=f"📊 Usage for {stats['month']}",
+            )
 
         elif by_provider:
-            providers = tracker.get_usage_by_provider()
-            console.print("\n[bold]📊 Usage by Provider[/bold]\n")
-
-            for p in providers:
-                cost_str = "FREE" if p["cost"] == 0 else f"${p['cost']:.4f}"
-                console.print(f"[cyan]{p['provider']}[/cyan] ({p['model']})")
-                console.print(f"  Requests: {p['requests']}")
-                console.print(f"  Tokens: {p['tokens']:,}")
-                console.print(f"  Cost: {cost_str}\n")
+            display_provider_usage(providers)
 
         else:
-            total = tracker.get_total_usage()
             cost_str = "FREE" if total["total_cost"] == 0 else f"${total['total_cost']:.4f}"
-            console.print("\n[bold]📊 Total Usage Statistics[/bold]\n")
-            console.print(f"  Total Requests: {total['total_requests']}")
-            console.print(f"  Successful: {total['successful_requests']}")
-            console.print(f"  Total Tokens: {total['total_tokens']:,}")
-            console.print(f"  Total Cost: {cost_str}\n")
+            display_usage_stats(
+                {
+                    "Total Requests": total["total_requests"],
+                    "Successful": total["successful_requests"],
+                    "Total Tokens": f"{total['total_tokens']:,}",
+                    "Total Cost": cost_str,
+                },
+                title="📊 Total Usage Statistics",
+            )
 
     except Exception as e:
         print_error(f"Failed to retrieve usage statistics: {e}")
@@ -285,38 +449,32 @@ def config() -> None:
     try:
         cfg = load_config()
 
-        console.print("\n[bold]⚙️  Current Configuration[/bold]\n")
-        console.print(f"  AI Provider: [cyan]{cfg.ai_provider}[/cyan]")
-
-        if cfg.ai_provider == "openrouter" and "free" in cfg.ai_model.lower():
-            console.print(f"  AI Model: {cfg.ai_model} [green](FREE)[/green]")
-        else:
-            console.print(f"  AI Model: {cfg.ai_model}")
-
-        console.print(f"  Max Tokens: {cfg.max_tokens}")
-        console.print(f"  Temperature: {cfg.temperature}")
-        console.print(f"  Commit Format: {cfg.commit_format}")
-        console.print(f"  Max Subject Length: {cfg.max_subject_length}")
-        console.print(f"  Track Usage: {cfg.track_usage}")
-
+        is_free = cfg.ai_provider == "openrouter" and "free" in cfg.ai_model.lower()
         if cfg.api_key:
-            masked_key = cfg.api_key[:8] + "..." + cfg.api_key[-4:]
-            console.print(f"  API Key: {masked_key}")
+            api_key = cfg.api_key[:8] + "..." + cfg.api_key[-4:]
         else:
-            if cfg.ai_provider == "openrouter":
-                console.print("  API Key: [green]Using built-in FREE key[/green]")
-            else:
-                console.print("  API Key: [red]Not set[/red]")
-
-        console.print(f"\n[dim]Config file: {cfg.get_config_path()}[/dim]")
-        console.print(f"[dim]Usage database: {cfg.get_usage_db_path()}[/dim]")
-
-        if cfg.ai_provider == "openrouter":
-            console.print(
-                "\\n[green]💡 Tip: You're using FREE OpenRouter - no API key needed![/green]"
-            )
+            api_key = "[red]Not set[/red]"
+
+        display_settings(
+            {
+                "AI Provider": f"[cyan]{cfg.ai_provider}[/cyan]",
+                "AI Model": f"{cfg.ai_model} [green](FREE)[/green]" if is_free else cfg.ai_model,
+                "Max Tokens": str(cfg.max_tokens),
+                "Temperature": str(cfg.temperature),
+                "Commit Format": cfg.commit_format,
+                "Max Subject Length": str(cfg.max_subject_length),
+                "Track Usage": str(cfg.track_usage),
+                "API Key": api_key,
+            }
+        )
 
-        console.print()
+        footer = (
+            f"\n[dim]Config file: {cfg.get_config_path()}\n"
+            f"Usage database: {cfg.get_usage_db_path()}[/dim]\n"
+        )
+        if is_free:
+            footer += "\n[green]💡 Tip: You're using a FREE OpenRouter model![/green]\n"
+        console.print(footer)
 
     except Exception as e:
         print_error(f"Failed to load configuration: {e}")
@@ -328,7 +486,7 @@ def version() -> None:
     """Show version information."""
     console.print(f"\n[bold cyan]diff2commit[/bold cyan] version [green]{__version__}[/green]")
     console.print("[dim]Default: OpenRouter Qwen 2.5 Coder 32B (FREE)[/dim]")
-    console.print("[dim]Also supports: OpenAI GPT, Google Gemini (requires API key)[/dim]\\n")
+    console.print("[dim]Also supports: OpenAI GPT, Google Gemini (requires API key)[/dim]\n")
 
 
 def main() -> None:
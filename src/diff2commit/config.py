@@ -1,5 +1,6 @@
 """Configuration management for Diff2Commit CLI."""
 
+import functools
 from typing import Optional, Literal
 from pathlib import Path
 
@@ -19,7 +20,7 @@ class Diff2CommitConfig(BaseSettings):
     )
     api_key: Optional[str] = Field(
         default=None,
-        description="API key for the AI provider (not required for OpenRouter free tier)",
+        description="API key for the AI provider",
     )
     api_endpoint: Optional[str] = Field(default=None, description="Custom API endpoint (optional)")
 
@@ -28,8 +29,14 @@ class Diff2CommitConfig(BaseSettings):
         default=200, ge=50, le=1000, description="Maximum tokens for generation"
     )
     temperature: float = Field(default=0.7, ge=0.0, le=2.0, description="Sampling temperature")
+    max_input_tokens: int = Field(
+        default=750, ge=100, le=100000, description="Approximate token budget for the diff"
+    )
     timeout: int = Field(default=30, ge=5, le=120, description="API request timeout in seconds")
     max_retries: int = Field(default=3, ge=1, le=10, description="Maximum retry attempts")
+    max_concurrency: int = Field(
+        default=4, ge=1, le=16, description="Maximum concurrent API requests"
+    )
 
     # Commit Message Settings
     commit_format: Literal["conventional", "custom"] = Field(
@@ -46,8 +53,25 @@ class Diff2CommitConfig(BaseSettings):
         default=None, description="Monthly cost limit in USD"
     )
 
+    # Response Cache
+    enable_cache: bool = Field(default=False, description="Cache generated messages on disk")
+    cache_dir: Path = Field(
+        default_factory=lambda: Path.home() / ".cache" / "diff2commit" / "llm_cache",
+        description="Directory for cached responses",
+    )
+    semantic_cache: bool = Field(
+        default=False, description="Also reuse responses for near-duplicate diffs"
+    )
+    semantic_threshold: float = Field(
+        default=0.92, ge=0.5, le=1.0, description="Cosine similarity needed for a semantic hit"
+    )
+
     # Advanced Settings
     verbose: bool = Field(default=False, description="Enable verbose output")
+    quiet: bool = Field(
+        default=False,
+        description="Skip the staged changes table, progress spinner and message panel",
+    )
 
     model_config = SettingsConfigDict(
         env_prefix="D2C_",
@@ -55,6 +79,8 @@ class Diff2CommitConfig(BaseSettings):
         env_file_encoding="utf-8",
         extra="ignore",
         case_sensitive=False,
+        # Shared by every caller of the cached load_config(); use model_copy(update=...)
+        frozen=True,
     )
 
     @field_validator("api_key")
@@ -66,19 +92,33 @@ class Diff2CommitConfig(BaseSettings):
 
     def get_config_path(self) -> Path:
         """Get the configuration file path."""
-        home = Path.home()
-        config_dir = home / ".config" / "d2c"
-        config_dir.mkdir(parents=True, exist_ok=True)
-        return config_dir / "config.toml"
+        return _ensure_dir(Path.home() / ".config" / "d2c") / "config.toml"
 
     def get_usage_db_path(self) -> Path:
         """Get the usage database path."""
-        home = Path.home()
-        data_dir = home / ".local" / "share" / "d2c"
-        data_dir.mkdir(parents=True, exist_ok=True)
-        return data_dir / "usage.db"
+        return _ensure_dir(Path.home() / ".local" / "share" / "d2c") / "usage.db"
+
+
+@functools.lru_cache(maxsize=None)
+def _ensure_dir(path: Path) -> Path:
+    """Create a directory once per process, skipping the mkdir when it already exists.
 
+    Args:
+        path: Directory to create
 
+    Returns:
+        The same path
+    """
+    if not path.exists():
+        path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+@functools.lru_cache(maxsize=1)
 def load_config() -> Diff2CommitConfig:
-    """Load configuration from environment and files."""
+    """Load configuration from environment and files.
+
+    The environment and ``.env`` file are read once per process; call
+    ``load_config.cache_clear()`` to pick up changes.
+    """
     return Diff2CommitConfig()
@@ -1,10 +1,32 @@
 """Git operations for retrieving diffs and committing changes."""
 
-from typing import List, Dict
-from dataclasses import dataclass
+import fnmatch
+import os
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+from dataclasses import dataclass, field
 import git
 from git.exc import GitCommandError, InvalidGitRepositoryError
 
+# Upper bound on patch bytes read from git; the prompt budget trims further per file
+MAX_DIFF_BYTES = 64 * 1024
+
+# Generated and vendored files whose patches carry no signal for a commit message.
+# Matched against the file name; such files are summarized in one line instead.
+SKIP_PATTERNS: Tuple[str, ...] = (
+    "*.lock",
+    "package-lock.json",
+    "yarn.lock",
+    "pnpm-lock.yaml",
+    "*.min.js",
+    "*.min.css",
+    "*.map",
+    "*.pb.go",
+    "*_pb2.py",
+    "*.svg",
+)
+
 
 @dataclass
 class DiffSummary:
@@ -16,20 +38,95 @@ class DiffSummary:
     diff_text: str
     change_types: Dict[str, str]
     is_empty: bool
+    truncated: bool = False
+    # Change type of each file, in the order of files_changed
+    statuses: List[str] = field(default_factory=list)
+
+
+@dataclass
+class FileChange:
+    """Status and line counts of one staged file."""
+
+    path: str
+    status: str
+    # None for binary files
+    added: Optional[int] = None
+    deleted: Optional[int] = None
+    # Source path of a rename or copy
+    old_path: Optional[str] = None
+
+
+def _parse_raw_numstat(output: str) -> List[FileChange]:
+    """Parse ``git diff --raw --numstat -z`` output.
+
+    Raw records come first (``:<modes> <shas> <status>`` followed by one path,
+    or two for renames and copies), then one numstat record per file in the
+    same order. Binary files report ``-`` for their line counts.
+
+    Args:
+        output: NUL-separated diff output
+
+    Returns:
+        List of FileChange objects
+    """
+    changes: List[FileChange] = []
+    numstat_index = 0
+
+    tokens = iter(output.split("\0"))
+    for token in tokens:
+        if not token:
+            continue
+
+        if token.startswith(":"):
+            status = token.rsplit(" ", 1)[-1][0]
+            path = next(tokens)
+            old_path = None
+            if status in ("R", "C"):
+                # Renames and copies list the source path, then the destination
+                old_path, path = path, next(tokens)
+            changes.append(FileChange(path=path, status=status, old_path=old_path))
+        else:
+            added, deleted, path = token.split("\t", 2)
+            if not path:
+                # Renames and copies put both paths in the following tokens
+                next(tokens)
+                next(tokens)
+            if added != "-":
+                change = changes[numstat_index]
+                change.added = int(added)
+                change.deleted = int(deleted)
+            numstat_index += 1
+
+    return changes
 
 
 class GitOperations:
     """Handle Git repository operations."""
 
-    def __init__(self, repo_path: str = "."):
+    def __init__(
+        self,
+        repo_path: Union[str, "os.PathLike[str]"] = ".",
+        max_diff_bytes: int = MAX_DIFF_BYTES,
+        skip_patterns: Tuple[str, ...] = SKIP_PATTERNS,
+        max_file_lines: Optional[int] = None,
+    ):
         """Initialize Git operations.
 
         Args:
             repo_path: Path to Git repository (default: current directory)
+            max_diff_bytes: Maximum number of patch bytes read into memory
+            skip_patterns: File name patterns whose patches are summarized, not included
+            max_file_lines: Also summarize files with more changed lines than this
 
         Raises:
             InvalidGitRepositoryError: If not a valid Git repository
         """
+        # A missing path needs no repository discovery walk to be rejected
+        if not os.path.exists(repo_path):
+            raise InvalidGitRepositoryError(
+                f"Not a git repository: {repo_path}. Please run 'git init' first."
+            )
+
         try:
             self.repo = git.Repo(repo_path, search_parent_directories=True)
         except (InvalidGitRepositoryError, git.NoSuchPathError) as e:
@@ -37,23 +134,51 @@ class GitOperations:
                 f"Not a git repository: {repo_path}. Please run 'git init' first."
             ) from e
 
+        # Hot paths call git directly instead of going through GitPython's object layer
+        self._git_cmd = ["git", "-C", str(self.repo.working_dir or repo_path)]
+
+        self.max_diff_bytes = max_diff_bytes
+        self.skip_patterns = skip_patterns
+        self.max_file_lines = max_file_lines
+
+        # Summary of the staged changes, computed on first use
+        self._staged_diff_cache: Optional[DiffSummary] = None
+        # Repository info, keyed by the modification times of HEAD and the config
+        self._repo_info_cache: Optional[Tuple[Tuple[int, int], Dict[str, str]]] = None
+
     def get_staged_diff(self) -> DiffSummary:
         """Get summary of staged changes.
 
+        The summary is computed once and reused until the next commit.
+
         Returns:
             DiffSummary object containing staged changes
 
         Raises:
             ValueError: If no staged changes found
         """
-        # Get staged changes
-        try:
-            diff_index = self.repo.index.diff("HEAD", create_patch=True)
-        except GitCommandError:
-            # No HEAD yet (initial commit)
-            diff_index = self.repo.index.diff(None, create_patch=True)
+        if self._staged_diff_cache is None:
+            self._staged_diff_cache = self._compute_staged_diff()
+        return self._staged_diff_cache
+
+    def get_staged_files(self) -> List[FileChange]:
+        """List the staged files with their status and line counts.
+
+        Only git's per-file statistics are read, never the patch text, so this
+        stays cheap for callers that do not need the diff itself.
 
-        if not diff_index:
+        Returns:
+            List of FileChange objects
+        """
+        # One call for per-file status and line counts, tallied by git itself
+        stats = self._run_git("diff", "--staged", "--raw", "--numstat", "-z")
+        return _parse_raw_numstat(stats.decode("utf-8", errors="replace"))
+
+    def _compute_staged_diff(self) -> DiffSummary:
+        """Run git to summarize the staged changes."""
+        changes = self.get_staged_files()
+
+        if not changes:
             return DiffSummary(
                 files_changed=[],
                 additions=0,
@@ -63,41 +188,76 @@ class GitOperations:
                 is_empty=True,
             )
 
-        files_changed: List[str] = []
-        change_types: Dict[str, str] = {}
+        # Binary and generated files get a one-line summary instead of a patch
+        summaries: List[str] = []
+        excludes: List[str] = []
+        for change in changes:
+            summary = self._skip_summary(change)
+            if summary is None:
+                continue
+            summaries.append(summary + "\n")
+            for path in (change.path, change.old_path):
+                if path is not None:
+                    excludes.append(f":(exclude,literal){path}")
+
+        # Get diff text for the prompt, reading no more than needed
+        raw_diff, truncated = memoryview(b""), False
+        if len(summaries) < len(changes):
+            raw_diff, truncated = self._read_git_bounded(
+                self.max_diff_bytes, "diff", "--staged", "-U3", "--no-color", "--", *excludes
+            )
 
-        for diff_item in diff_index:
-            file_path = diff_item.b_path or diff_item.a_path
-            if file_path is not None:
-                files_changed.append(file_path)
-                if diff_item.change_type is not None:
-                    change_types[file_path] = diff_item.change_type
+        return DiffSummary(
+            files_changed=[change.path for change in changes],
+            additions=sum(change.added or 0 for change in changes),
+            deletions=sum(change.deleted or 0 for change in changes),
+            diff_text="".join(summaries) + str(raw_diff, "utf-8", "replace"),
+            change_types={change.path: change.status for change in changes},
+            is_empty=False,
+            truncated=truncated,
+            statuses=[change.status for change in changes],
+        )
 
-        # Get full diff text
-        try:
-            full_diff = self.repo.git.diff("--staged")
-        except GitCommandError:
-            # Initial commit
-            full_diff = self.repo.git.diff("--staged", "--cached")
+    def _skip_summary(self, change: FileChange) -> Optional[str]:
+        """Summarize a file whose patch should be left out of the diff text.
 
-        additions = 0
-        deletions = 0
+        Args:
+            change: Staged file change
 
-        # Count additions and deletions
-        for line in full_diff.splitlines():
-            if line.startswith("+") and not line.startswith("+++"):
-                additions += 1
-            elif line.startswith("-") and not line.startswith("---"):
-                deletions += 1
+        Returns:
+            One-line summary, or None if the patch should be included
+        """
+        if change.added is None:
+            return f"<binary: {change.path}>"
 
-        return DiffSummary(
-            files_changed=files_changed,
-            additions=max(0, additions),
-            deletions=max(0, deletions),
-            diff_text=full_diff,
-            change_types=change_types,
-            is_empty=False,
+        name = change.path.rsplit("/", 1)[-1]
+        changed_lines = change.added + (change.deleted or 0)
+        if any(fnmatch.fnmatchcase(name, pattern) for pattern in self.skip_patterns) or (
+            self.max_file_lines is not None and changed_lines > self.max_file_lines
+        ):
+            return f"<skipped: {change.path} (+{change.added} -{change.deleted})>"
+        return None
+
+    def stage(self, paths: List[str]) -> None:
+        """Stage files for the next commit.
+
+        Args:
+            paths: Paths relative to the repository root
+
+        Raises:
+            GitCommandError: If git cannot stage the paths
+        """
+        # One git process and one index write for any number of paths. The paths
+        # go through stdin, so long lists cannot overflow the command line, and are
+        # read literally so names containing '*', '[' or ':(' match only themselves.
+        self._run_git(
+            "--literal-pathspecs",
+            "add",
+            "--pathspec-from-file=-",
+            "--pathspec-file-nul",
+            stdin=b"\0".join(os.fsencode(path) for path in paths),
         )
+        self._staged_diff_cache = None
 
     def commit_changes(self, message: str) -> str:
         """Commit staged changes with the given message.
@@ -112,17 +272,39 @@ class GitOperations:
             GitCommandError: If commit fails
         """
         try:
-            commit = self.repo.index.commit(message)
-            return commit.hexsha
+            self._run_git("commit", "--quiet", "-m", message)
+            self._staged_diff_cache = None
+            return self._run_git("rev-parse", "HEAD").decode("ascii").strip()
         except GitCommandError as e:
             raise GitCommandError(f"Failed to commit changes: {e}") from e
 
     def get_repo_info(self) -> Dict[str, str]:
         """Get repository information.
 
+        The result is reused until HEAD or the repository config changes, for
+        example after switching branches or adding a remote.
+
         Returns:
             Dictionary with repository info
         """
+        # A linked worktree has its own HEAD but shares config with the main repository
+        try:
+            key = (
+                (Path(self.repo.git_dir) / "HEAD").stat().st_mtime_ns,
+                (Path(self.repo.common_dir) / "config").stat().st_mtime_ns,
+            )
+        except OSError:
+            return self._compute_repo_info()
+
+        if self._repo_info_cache is not None and self._repo_info_cache[0] == key:
+            return self._repo_info_cache[1]
+
+        info = self._compute_repo_info()
+        self._repo_info_cache = (key, info)
+        return info
+
+    def _compute_repo_info(self) -> Dict[str, str]:
+        """Read the branch, remote and root from the repository."""
         try:
             branch = self.repo.active_branch.name
         except TypeError:
@@ -151,6 +333,76 @@ class GitOperations:
 
         Returns:
             True if there are staged changes
+
+        Raises:
+            GitCommandError: If git fails, for example on a corrupt index
         """
-        diff_summary = self.get_staged_diff()
-        return not diff_summary.is_empty
+        if self._staged_diff_cache is not None:
+            return not self._staged_diff_cache.is_empty
+
+        # --quiet exits with 1 when there are differences, without producing a patch
+        args = ("diff", "--staged", "--quiet")
+        result = subprocess.run([*self._git_cmd, *args], capture_output=True, check=False)
+        if result.returncode not in (0, 1):
+            raise GitCommandError(
+                ["git", *args], result.returncode, result.stderr.decode("utf-8", errors="replace")
+            )
+        return result.returncode == 1
+
+    def _read_git_bounded(self, limit: int, *args: str) -> Tuple[memoryview, bool]:
+        """Run a git command, reading at most ``limit`` bytes of its output.
+
+        git is stopped as soon as the limit is exceeded, so a huge patch is
+        never fully produced or held in memory. Truncated output is cut back
+        to the last complete line through a view, without copying the bytes.
+
+        Args:
+            limit: Maximum number of bytes to return
+            args: git subcommand and arguments
+
+        Returns:
+            Tuple of (output, whether it was truncated)
+
+        Raises:
+            GitCommandError: If git fails before the limit is reached
+        """
+        proc = subprocess.Popen(
+            [*self._git_cmd, *args], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        assert proc.stdout is not None
+        try:
+            output = proc.stdout.read(limit + 1)
+        finally:
+            proc.stdout.close()
+            if proc.poll() is None:
+                proc.kill()
+            proc.wait()
+
+        if len(output) > limit:
+            return memoryview(output)[: output.rfind(b"\n", 0, limit) + 1], True
+
+        if proc.returncode != 0:
+            raise GitCommandError(["git", *args], proc.returncode)
+        return memoryview(output), False
+
+    def _run_git(self, *args: str, stdin: Optional[bytes] = None) -> bytes:
+        """Run a git command in the repository.
+
+        Args:
+            args: git subcommand and arguments
+            stdin: Data written to git's standard input
+
+        Returns:
+            Raw standard output
+
+        Raises:
+            GitCommandError: If git exits with a non-zero status
+        """
+        result = subprocess.run(
+            [*self._git_cmd, *args], input=stdin, capture_output=True, check=False
+        )
+        if result.returncode != 0:
+            raise GitCommandError(
+                ["git", *args], result.returncode, result.stderr.decode("utf-8", errors="replace")
+            )
+        return result.stdout
@@ -1,6 +1,13 @@
 """Prompt templates for AI commit message generation."""
 
-from typing import Dict, Any
+import functools
+import hashlib
+import re
+import string
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+from diff2commit.summaries import FileSummary, build_file_summary
 
 # System prompt for AI model
 SYSTEM_PROMPT = """
@@ -101,6 +108,114 @@ You are an expert Git assistant tasked with creating clear, descriptive, and con
 """
 
 
+# Splits a unified diff into per-file sections, keeping each "diff --git" header
+_FILE_SPLIT_RE = re.compile(r"^(?=diff --git )", re.MULTILINE)
+
+
+def _truncation_marker(line_count: int) -> str:
+    """Marker appended to a file diff that lost ``line_count`` lines."""
+    return f"... [truncated {line_count} lines]\n"
+
+
+def _more_files_line(count: int) -> str:
+    """Line standing in for ``count`` files left out of a truncated diff."""
+    return f"... and {count} more files\n" if count else ""
+
+
+def _min_section_chars(section: str) -> int:
+    """Smallest output of :func:`_truncate_file_diff` for a section: its header plus marker."""
+    header_end = section.find("\n") + 1 or len(section)
+    return min(len(section), header_end + len(_truncation_marker(section.count("\n"))))
+
+
+def _truncate_file_diff(section: str, budget: int) -> str:
+    """Truncate one file's diff to a character budget on line boundaries.
+
+    The ``diff --git`` line is always kept so the file stays identifiable, and
+    room for the truncation marker is reserved inside the budget.
+
+    Args:
+        section: Diff text for a single file
+        budget: Maximum characters to keep
+
+    Returns:
+        The section, or its leading lines followed by a truncation marker
+    """
+    if len(section) <= budget:
+        return section
+
+    lines = section.splitlines(keepends=True)
+    kept: List[str] = [lines[0]]
+    used = len(lines[0]) + len(_truncation_marker(len(lines)))
+    for line in lines[1:]:
+        if used + len(line) > budget:
+            break
+        kept.append(line)
+        used += len(line)
+
+    if not kept[-1].endswith("\n"):
+        kept.append("\n")
+    kept.append(_truncation_marker(len(lines) - len(kept)))
+    return "".join(kept)
+
+
+def truncate_diff(diff: str, max_chars: int) -> str:
+    """Truncate a diff to at most ``max_chars``, keeping as many files visible as fit.
+
+    The budget is shared between files: small files are kept whole and the
+    rest is split evenly among the larger ones, each cut on a line boundary
+    with a marker noting how many lines were dropped. Once an even share no
+    longer covers a file's header and marker, the remaining files are
+    replaced by a single ``... and N more files`` line.
+
+    Args:
+        diff: The git diff text
+        max_chars: Character budget for the whole diff
+
+    Returns:
+        The diff, truncated if it exceeds the budget
+    """
+    if len(diff) <= max_chars:
+        return diff
+
+    sections = [section for section in _FILE_SPLIT_RE.split(diff) if section]
+
+    # Keep the longest run of leading files whose minimal output fits an even share
+    shown, largest = 0, 0
+    for count, section in enumerate(sections, start=1):
+        largest = max(largest, _min_section_chars(section))
+        overflow = _more_files_line(len(sections) - count)
+        if count * largest > max_chars - len(overflow):
+            break
+        shown = count
+    overflow = _more_files_line(len(sections) - shown)
+    sections = sections[:shown]
+
+    budgets = [0] * len(sections)
+    remaining = max_chars - len(overflow)
+    # Hand out budget smallest-first so unused share flows to larger files
+    order = sorted(range(len(sections)), key=lambda i: len(sections[i]))
+    for position, index in enumerate(order):
+        share = remaining // (len(sections) - position)
+        budgets[index] = min(len(sections[index]), share)
+        remaining -= budgets[index]
+
+    truncated = "".join(
+        _truncate_file_diff(section, budget) for section, budget in zip(sections, budgets)
+    )
+    return truncated + overflow
+
+
+# Fixed opening of every user prompt. Keeping all per-request text after it lets
+# provider-side prefix caches match the system prompt plus this framing.
+PROMPT_PREFIX = (
+    "Analyze the following staged changes and generate a Conventional Commit message.\n\n"
+)
+
+
+_EMOJI_INSTRUCTION = "\nInclude an appropriate emoji at the start of the commit message."
+
+
 def build_commit_prompt(
     diff: str,
     files_changed: list,
@@ -108,6 +223,8 @@ def build_commit_prompt(
     deletions: int,
     change_types: Dict[str, str],
     include_emoji: bool = False,
+    max_diff_chars: int = 3000,
+    summary: Optional[FileSummary] = None,
 ) -> str:
     """Build the user prompt for commit message generation.
 
@@ -118,48 +235,156 @@ def build_commit_prompt(
         deletions: Number of deletions
         change_types: Dictionary mapping files to change types
         include_emoji: Whether to include emojis
+        max_diff_chars: Character budget for the embedded diff
+        summary: Prebuilt file summary, shared with the terminal display
 
     Returns:
         Formatted prompt string
     """
-    # Summarize file changes
-    file_summary = []
-    for file in files_changed[:10]:  # Limit to first 10 files
-        change_type = change_types.get(file, "M")
-        file_summary.append(f"  {change_type} {file}")
+    return PROMPT_PREFIX + build_prompt_suffix(
+        diff,
+        files_changed,
+        additions,
+        deletions,
+        change_types,
+        include_emoji,
+        max_diff_chars,
+        summary,
+    )
+
+
+# Prompts built for recent diffs, most recently used last
+_PROMPT_CACHE: "OrderedDict[Tuple[Any, ...], str]" = OrderedDict()
+_PROMPT_CACHE_SIZE = 32
 
-    if len(files_changed) > 10:
-        file_summary.append(f"  ... and {len(files_changed) - 10} more files")
 
-    files_text = "\\n".join(file_summary)
+def build_commit_prompt_cached(
+    diff: str,
+    files_changed: list,
+    additions: int,
+    deletions: int,
+    change_types: Dict[str, str],
+    include_emoji: bool = False,
+    max_diff_chars: int = 3000,
+    summary: Optional[FileSummary] = None,
+) -> str:
+    """Build the user prompt, reusing the result for a diff seen recently in this process.
+
+    Regenerating messages for the same staged changes then skips truncation and
+    assembly, and sends a byte-identical prompt that provider caches can match.
 
-    # Truncate diff if too long (keep first 3000 chars)
-    truncated_diff = diff[:3000]
-    if len(diff) > 3000:
-        truncated_diff += "\\n\\n... (diff truncated)"
+    Args:
+        diff: The git diff text
+        files_changed: List of changed files
+        additions: Number of additions
+        deletions: Number of deletions
+        change_types: Dictionary mapping files to change types
+        include_emoji: Whether to include emojis
+        max_diff_chars: Character budget for the embedded diff
+        summary: Prebuilt file summary, used only when the prompt is not cached
 
-    emoji_instruction = ""
-    if include_emoji:
-        emoji_instruction = "\\nInclude an appropriate emoji at the start of the commit message."
+    Returns:
+        Formatted prompt string
+    """
+    key = (
+        hashlib.blake2b(diff.encode("utf-8"), digest_size=16).digest(),
+        tuple(files_changed),
+        additions,
+        deletions,
+        tuple(sorted(change_types.items())),
+        include_emoji,
+        max_diff_chars,
+    )
+    prompt = _PROMPT_CACHE.get(key)
+    if prompt is not None:
+        _PROMPT_CACHE.move_to_end(key)
+        return prompt
+
+    prompt = build_commit_prompt(
+        diff,
+        files_changed,
+        additions,
+        deletions,
+        change_types,
+        include_emoji,
+        max_diff_chars,
+        summary,
+    )
+    _PROMPT_CACHE[key] = prompt
+    if len(_PROMPT_CACHE) > _PROMPT_CACHE_SIZE:
+        _PROMPT_CACHE.popitem(last=False)
+    return prompt
 
-    prompt = f"""Analyze the following staged changes and generate a Conventional Commit message.
 
-Files changed ({len(files_changed)}):
-{files_text}
+def build_prompt_suffix(
+    diff: str,
+    files_changed: list,
+    additions: int,
+    deletions: int,
+    change_types: Dict[str, str],
+    include_emoji: bool = False,
+    max_diff_chars: int = 3000,
+    summary: Optional[FileSummary] = None,
+) -> str:
+    """Build the per-request part of the user prompt that follows ``PROMPT_PREFIX``.
 
-Statistics:
-  +{additions} additions, -{deletions} deletions
+    Args:
+        diff: The git diff text
+        files_changed: List of changed files
+        additions: Number of additions
+        deletions: Number of deletions
+        change_types: Dictionary mapping files to change types
+        include_emoji: Whether to include emojis
+        max_diff_chars: Character budget for the embedded diff
+        summary: Prebuilt file summary, shared with the terminal display
 
-Git diff:
-```
-{truncated_diff}
-```
-{emoji_instruction}
+    Returns:
+        Formatted prompt string
+    """
+    # Summarize file changes, limited to the first 10 files
+    if summary is None:
+        summary = build_file_summary(files_changed, change_types)
+    files_text = "\n".join(summary.prompt_lines)
+
+    # Truncate diff if too long, keeping part of every file
+    truncated_diff = truncate_diff(diff, max_diff_chars)
+
+    # Joined once, rather than formatting one large multi-line f-string
+    parts = [
+        "Files changed (",
+        str(len(files_changed)),
+        "):\n",
+        files_text,
+        "\n\nStatistics:\n  +",
+        str(additions),
+        " additions, -",
+        str(deletions),
+        " deletions\n\nGit diff:\n```\n",
+        truncated_diff,
+        "\n```\n",
+        _EMOJI_INSTRUCTION if include_emoji else "",
+        "\n\n### Commit Message\n",
+    ]
+    return "".join(parts)
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_template(template: str) -> Optional[Tuple[Tuple[str, Optional[str]], ...]]:
+    """Split a format template into (literal, field_name) pairs once per template.
 
-### Commit Message
-"""
+    Args:
+        template: ``str.format`` style template
 
-    return prompt
+    Returns:
+        Parsed pairs, or None if the template uses format specs, conversions
+        or attribute/index lookups that only ``str.format`` can render
+    """
+    parsed = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        if spec or conversion or (field is not None and not field.isidentifier()):
+            return None
+        parsed.append((literal, field))
+    return tuple(parsed)
 
 
 def build_custom_prompt(diff: str, template: str, context: Dict[str, Any]) -> str:
@@ -172,16 +397,28 @@ def build_custom_prompt(diff: str, template: str, context: Dict[str, Any]) -> st
 
     Returns:
         Formatted prompt string
+
+    Raises:
+        KeyError: If the template references a variable that is not available
     """
-    # Replace template variables
-    prompt = template.format(
-        diff=diff[:3000],
-        files=", ".join(context.get("files_changed", [])),
-        additions=context.get("additions", 0),
-        deletions=context.get("deletions", 0),
+    values = {
         **context,
-    )
-    return prompt
+        "diff": diff[:3000],
+        "files": ", ".join(context.get("files_changed", [])),
+        "additions": context.get("additions", 0),
+        "deletions": context.get("deletions", 0),
+    }
+
+    parsed = _parse_template(template)
+    if parsed is None:
+        return template.format(**values)
+
+    parts: List[str] = []
+    for literal, field in parsed:
+        parts.append(literal)
+        if field is not None:
+            parts.append(str(values[field]))
+    return "".join(parts)
 
 
 # Example custom templates
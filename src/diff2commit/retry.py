@@ -0,0 +1,78 @@
+"""Retry helpers with exponential backoff and jitter."""
+
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Optional, Tuple, Type, TypeVar
+
+T = TypeVar("T")
+
+
+def _backoff(attempt: int, base: float, cap: float) -> float:
+    """Compute the delay before the next attempt.
+
+    Args:
+        attempt: Zero-based index of the attempt that just failed
+        base: Delay after the first failure in seconds
+        cap: Maximum delay in seconds
+
+    Returns:
+        Delay in seconds, with up to 0.5s of random jitter
+    """
+    return min(cap, base * (1 << attempt)) + random.uniform(0, 0.5)
+
+
+def retry_call(
+    fn: Callable[[], T],
+    *,
+    exceptions: Tuple[Type[BaseException], ...],
+    attempts: int = 3,
+    base: float = 2.0,
+    cap: float = 10.0,
+    give_up: Optional[Callable[[BaseException], bool]] = None,
+) -> T:
+    """Call ``fn``, retrying on the given exceptions with exponential backoff.
+
+    Args:
+        fn: Function to call
+        exceptions: Exception types that trigger a retry
+        attempts: Total number of attempts
+        base: Delay after the first failure in seconds
+        cap: Maximum delay in seconds
+        give_up: Called with each retryable error; returning True re-raises it
+            immediately instead of waiting for a retry that would fail anyway
+
+    Returns:
+        Result of ``fn``
+
+    Raises:
+        Exception: The last error once all attempts are exhausted
+    """
+    for attempt in range(attempts - 1):
+        try:
+            return fn()
+        except exceptions as e:
+            if give_up is not None and give_up(e):
+                raise
+            time.sleep(_backoff(attempt, base, cap))
+    return fn()
+
+
+async def aretry_call(
+    fn: Callable[[], Awaitable[T]],
+    *,
+    exceptions: Tuple[Type[BaseException], ...],
+    attempts: int = 3,
+    base: float = 2.0,
+    cap: float = 10.0,
+    give_up: Optional[Callable[[BaseException], bool]] = None,
+) -> T:
+    """Async counterpart of :func:`retry_call` that sleeps without blocking the loop."""
+    for attempt in range(attempts - 1):
+        try:
+            return await fn()
+        except exceptions as e:
+            if give_up is not None and give_up(e):
+                raise
+            await asyncio.sleep(_backoff(attempt, base, cap))
+    return await fn()
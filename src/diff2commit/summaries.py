@@ -0,0 +1,69 @@
+"""Per-file change summaries shared by the terminal display and the prompt."""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# Change type -> label shown in the staged changes table
+STATUS_LABELS: Dict[str, str] = {
+    "A": "[green]✚[/green] Added",
+    "M": "[yellow]●[/yellow] Modified",
+    "D": "[red]✖[/red] Deleted",
+    "R": "[blue]→[/blue] Renamed",
+}
+DEFAULT_LABEL = "[dim]●[/dim] Changed"
+
+
+@dataclass
+class FileSummary:
+    """Rendered per-file lines for the prompt and the staged changes table.
+
+    Each list is indexed by file position, so the strings for both consumers
+    are produced in one pass over the changed files.
+    """
+
+    files: List[str] = field(default_factory=list)
+    statuses: List[str] = field(default_factory=list)
+    prompt_lines: List[str] = field(default_factory=list)
+    table_rows: List[Tuple[str, str]] = field(default_factory=list)
+
+
+def build_file_summary(
+    files_changed: List[str],
+    change_types: Dict[str, str],
+    limit_prompt: int = 10,
+    limit_display: int = 20,
+    statuses: Optional[List[str]] = None,
+) -> FileSummary:
+    """Build the per-file lines used by the prompt and the staged changes table.
+
+    Args:
+        files_changed: List of changed files
+        change_types: Dictionary mapping files to change types
+        limit_prompt: Maximum files listed in the prompt
+        limit_display: Maximum files listed in the table
+        statuses: Change type of each file in ``files_changed`` order, used
+            instead of looking every file up in ``change_types``
+
+    Returns:
+        FileSummary with an overflow line appended to each list that was cut short
+    """
+    summary = FileSummary()
+    listed = files_changed[: max(limit_prompt, limit_display)]
+    if not statuses:
+        statuses = [change_types.get(file, "M") for file in listed]
+
+    for index, (file, status) in enumerate(zip(listed, statuses)):
+        summary.files.append(file)
+        summary.statuses.append(status)
+        if index < limit_prompt:
+            summary.prompt_lines.append(f"  {status} {file}")
+        if index < limit_display:
+            summary.table_rows.append((STATUS_LABELS.get(status, DEFAULT_LABEL), file))
+
+    if len(files_changed) > limit_prompt:
+        summary.prompt_lines.append(f"  ... and {len(files_changed) - limit_prompt} more files")
+    if len(files_changed) > limit_display:
+        summary.table_rows.append(
+            ("[dim]...[/dim]", f"[dim]and {len(files_changed) - limit_display} more files[/dim]")
+        )
+    return summary
@@ -1,8 +1,35 @@
 """User interface components."""
 
-from diff2commit.ui import console
-from diff2commit.ui.console import print_error, print_info, print_success, print_warning
-from diff2commit.ui.interactive import InteractiveEditor
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from diff2commit.ui import console
+    from diff2commit.ui.console import print_error, print_info, print_success, print_warning
+    from diff2commit.ui.interactive import InteractiveEditor
+
+# Public name -> (module, attribute); None imports the module itself. Rich and
+# prompt_toolkit are only loaded once one of these is first accessed.
+_LAZY_ATTRS = {
+    "console": ("diff2commit.ui.console", None),
+    "print_error": ("diff2commit.ui.console", "print_error"),
+    "print_success": ("diff2commit.ui.console", "print_success"),
+    "print_info": ("diff2commit.ui.console", "print_info"),
+    "print_warning": ("diff2commit.ui.console", "print_warning"),
+    "InteractiveEditor": ("diff2commit.ui.interactive", "InteractiveEditor"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import UI helpers, and the rich or prompt_toolkit modules behind them, on first access."""
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module_name, attr = _LAZY_ATTRS[name]
+    module = importlib.import_module(module_name)
+    value = module if attr is None else getattr(module, attr)
+    globals()[name] = value
+    return value
 
 
 __all__ = [
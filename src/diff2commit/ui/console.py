@@ -2,10 +2,14 @@
 
 from rich.console import Console
 from rich.panel import Panel
-from rich.syntax import Syntax
 from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from typing import Dict, Any
+from rich.text import Text
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
+
+from diff2commit.summaries import FileSummary, build_file_summary
+
+if TYPE_CHECKING:
+    from rich.progress import Progress
 
 # Global console instance
 console = Console()
@@ -32,49 +36,58 @@ def print_warning(message: str) -> None:
 
 
 def display_diff_summary(
-    files_changed: list, additions: int, deletions: int, change_types: Dict[str, str]
+    files_changed: list,
+    additions: int,
+    deletions: int,
+    change_types: Dict[str, str],
+    summary: Optional[FileSummary] = None,
 ) -> None:
-    """Display a summary of the diff."""
-    console.print("\\n[bold]📝 Staged Changes:[/bold]")
+    """Display a summary of the diff.
+
+    Args:
+        files_changed: List of changed files
+        additions: Number of additions
+        deletions: Number of deletions
+        change_types: Dictionary mapping files to change types
+        summary: Prebuilt file summary, shared with the prompt to avoid a second pass
+    """
+    if not files_changed:
+        return
+    if summary is None:
+        summary = build_file_summary(files_changed, change_types)
+
+    console.print("\n[bold]📝 Staged Changes:[/bold]")
 
     table = Table(show_header=True, header_style="bold cyan")
     table.add_column("Status", style="dim", width=8)
     table.add_column("File")
-
-    # Change type symbols
-    symbols = {
-        "A": "[green]✚[/green] Added",
-        "M": "[yellow]●[/yellow] Modified",
-        "D": "[red]✖[/red] Deleted",
-        "R": "[blue]→[/blue] Renamed",
-    }
-
-    for file in files_changed[:20]:  # Show max 20 files
-        change_type = change_types.get(file, "M")
-        symbol = symbols.get(change_type, "[dim]●[/dim] Changed")
-        table.add_row(symbol, file)
-
-    if len(files_changed) > 20:
-        table.add_row("[dim]...[/dim]", f"[dim]and {len(files_changed) - 20} more files[/dim]")
+    for row in summary.table_rows:
+        table.add_row(*row)
 
     console.print(table)
     console.print(
-        f"\\n[dim]Stats: [green]+{additions}[/green] additions, [red]-{deletions}[/red] deletions[/dim]\\n"
+        f"\n[dim]Stats: [green]+{additions}[/green] additions, [red]-{deletions}[/red] deletions[/dim]\n"
     )
 
 
 def display_commit_message(message: str, title: str = "Generated Commit Message") -> None:
-    """Display a commit message with syntax highlighting."""
-    syntax = Syntax(message, "git-commit", theme="monokai", line_numbers=False)
+    """Display a commit message with a highlighted subject line."""
+    subject, _, body = message.partition("\n")
+    text = Text(subject, style="bold cyan")
+    body = body.strip("\n")
+    if body:
+        text.append("\n\n")
+        text.append(body)
+
     panel = Panel(
-        syntax, title=f"[bold cyan]{title}[/bold cyan]", border_style="cyan", padding=(1, 2)
+        text, title=f"[bold cyan]{title}[/bold cyan]", border_style="cyan", padding=(1, 2)
     )
     console.print(panel)
 
 
-def display_usage_stats(stats: Dict[str, Any]) -> None:
+def display_usage_stats(stats: Dict[str, Any], title: str = "📊 Usage Statistics") -> None:
     """Display token usage and cost statistics."""
-    table = Table(title="[bold]📊 Usage Statistics[/bold]", show_header=True)
+    table = Table(title=f"[bold]{title}[/bold]", show_header=True)
     table.add_column("Metric", style="cyan")
     table.add_column("Value", justify="right")
 
@@ -84,8 +97,38 @@ def display_usage_stats(stats: Dict[str, Any]) -> None:
     console.print(table)
 
 
-def create_progress() -> Progress:
+def display_provider_usage(providers: List[Dict[str, Any]]) -> None:
+    """Display usage statistics grouped by provider and model."""
+    table = Table(title="[bold]📊 Usage by Provider[/bold]", show_header=True)
+    table.add_column("Provider", style="cyan")
+    table.add_column("Model")
+    table.add_column("Requests", justify="right")
+    table.add_column("Tokens", justify="right")
+    table.add_column("Cost", justify="right")
+
+    for p in providers:
+        cost_str = "FREE" if p["cost"] == 0 else f"${p['cost']:.4f}"
+        table.add_row(p["provider"], p["model"], str(p["requests"]), f"{p['tokens']:,}", cost_str)
+
+    console.print(table)
+
+
+def display_settings(settings: Dict[str, str], title: str = "⚙️  Current Configuration") -> None:
+    """Display configuration settings as a two-column table."""
+    table = Table(title=f"[bold]{title}[/bold]", show_header=False)
+    table.add_column("Setting", style="cyan")
+    table.add_column("Value")
+
+    for key, value in settings.items():
+        table.add_row(key, value)
+
+    console.print(table)
+
+
+def create_progress() -> "Progress":
     """Create a progress indicator."""
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
     return Progress(
         SpinnerColumn(), TextColumn("[progress.description]{task.description}"), console=console
     )
@@ -1,11 +1,13 @@
 """Interactive editor for reviewing and modifying commit messages."""
 
-from typing import Optional, List
-from prompt_toolkit import prompt
+from typing import Dict, Optional, List
 from rich.prompt import Confirm, Prompt
 
 from diff2commit.ui.console import console, display_commit_message
 
+# Answers accepted by the review prompt: accept, edit, regenerate, cancel
+_ACTION_CHOICES = ["a", "e", "r", "c"]
+
 
 class InteractiveEditor:
     """Interactive editor for commit messages."""
@@ -13,6 +15,8 @@ class InteractiveEditor:
     def __init__(self) -> None:
         """Initialize the interactive editor."""
         self.current_message = ""
+        # Selection choices per number of messages, built once
+        self._choice_cache: Dict[int, List[str]] = {}
 
     def review_and_edit(self, messages: List[str], show_diff: bool = True) -> Optional[str]:
         """Review and optionally edit commit message(s).
@@ -66,13 +70,27 @@ class InteractiveEditor:
         try:
             choice = Prompt.ask(
                 "Select a message",
-                choices=[str(i) for i in range(1, len(messages) + 1)],
+                choices=self._choices(len(messages)),
                 default="1",
             )
             return int(choice) - 1
         except (KeyboardInterrupt, EOFError):
             return None
 
+    def _choices(self, count: int) -> List[str]:
+        """Get the selection choices "1" to ``count``.
+
+        Args:
+            count: Number of messages
+
+        Returns:
+            Choice strings, shared between calls with the same count
+        """
+        choices = self._choice_cache.get(count)
+        if choices is None:
+            choices = self._choice_cache[count] = [str(i) for i in range(1, count + 1)]
+        return choices
+
     def _get_user_action(self) -> Optional[str]:
         """Get user action (accept, edit, regenerate, cancel).
 
@@ -86,14 +104,17 @@ class InteractiveEditor:
         console.print("  [red]c[/red] - Cancel")
 
         try:
-            action = Prompt.ask("\\nYour choice", choices=["a", "e", "r", "c"], default="a")
+            action = Prompt.ask("\\nYour choice", choices=_ACTION_CHOICES, default="a")
 
             if action == "a":
                 return self.current_message
             elif action == "e":
                 return self._edit_message()
             elif action == "r":
-                console.print("[blue]Please run the command again to regenerate.[/blue]")
+                console.print(
+                    "[blue]Please run the command again to regenerate "
+                    "(add --no-cache if response caching is enabled).[/blue]"
+                )
                 return None
             else:  # cancel
                 console.print("[red]Commit cancelled.[/red]")
@@ -109,24 +130,23 @@ class InteractiveEditor:
         Returns:
             Edited message or None
         """
-        console.print("\\n[yellow]Edit the commit message (press Enter twice when done):[/yellow]")
-        console.print("[dim]Tip: Keep the first line under 72 characters[/dim]\\n")
+        console.print(
+            "\n[yellow]Edit the commit message (press Esc then Enter when done):[/yellow]"
+        )
+        console.print("[dim]Tip: Keep the first line under 72 characters[/dim]\n")
+
+        # prompt_toolkit is slow to import and only needed when editing
+        from prompt_toolkit import prompt
 
-        lines: List[str] = []
         try:
-            # Read multiple lines
-            console.print(self.current_message)
-            console.print("\\n[yellow]Enter your edited message:[/yellow]")
-
-            while True:
-                line = prompt("> " if not lines else "  ")
-                if not line and lines:
-                    # Empty line and we have content, finish
-                    break
-                if line or lines:  # Add line if not first empty line
-                    lines.append(line)
-
-            edited = "\\n".join(lines).strip()
+            # One multi-line prompt, pre-filled with the current message; Esc-Enter
+            # (Meta-Enter) submits it
+            edited = prompt(
+                "> ",
+                multiline=True,
+                default=self.current_message,
+                prompt_continuation="  ",
+            ).strip()
 
             if edited:
                 self.current_message = edited
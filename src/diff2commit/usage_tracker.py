@@ -1,17 +1,50 @@
 """Track token usage and costs."""
 
+import contextlib
 import sqlite3
+import threading
+import time
+import weakref
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, TYPE_CHECKING
 from dataclasses import dataclass
 
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+# Per-connection tuning. WAL turns each commit into a log append, and NORMAL
+# sync is durable across application crashes in WAL mode.
+_CONNECTION_PRAGMAS = """
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=MEMORY;
+PRAGMA mmap_size=268435456;
+PRAGMA cache_size=-16384;
+PRAGMA busy_timeout=3000;
+"""
+
+# (timestamp, provider, model, tokens, cost, success) as stored in the usage table
+_UsageRow = Tuple[int, str, str, int, float, int]
+
+_CREATE_USAGE_TABLE = """
+CREATE TABLE IF NOT EXISTS usage (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp INTEGER NOT NULL,
+    provider TEXT NOT NULL,
+    model TEXT NOT NULL,
+    tokens INTEGER NOT NULL,
+    cost REAL NOT NULL,
+    success INTEGER NOT NULL
+)
+"""
+
 
 @dataclass
 class UsageRecord:
     """Record of API usage."""
 
-    timestamp: str
+    # Unix epoch seconds
+    timestamp: int
     provider: str
     model: str
     tokens: int
@@ -19,6 +52,25 @@ class UsageRecord:
     success: bool
 
 
+def _epoch_from_iso(value: Any) -> int:
+    """Convert a legacy ISO-8601 timestamp to epoch seconds.
+
+    Stored values are naive local times, which ``fromisoformat()`` keeps local.
+    Values that do not parse, such as hand-edited rows, become 0 so the row
+    still counts towards totals instead of aborting the migration.
+
+    Args:
+        value: Stored timestamp
+
+    Returns:
+        Epoch seconds, or 0 if the value is not a valid timestamp
+    """
+    try:
+        return int(datetime.fromisoformat(value).timestamp())
+    except (TypeError, ValueError):
+        return 0
+
+
 class UsageTracker:
     """Track and report on API usage and costs."""
 
@@ -35,29 +87,91 @@ class UsageTracker:
             db_path = data_dir / "usage.db"
 
         self.db_path = db_path
+        # Rows buffered while inside batch(); None when writing immediately
+        self._pending: Optional[List[_UsageRow]] = None
+
+        # One connection for the tracker's lifetime, closed with it or at exit.
+        # Writes span several statements, so each holds the lock until it commits.
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+        self._finalizer = weakref.finalize(self, self._conn.close)
         self._init_db()
 
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the usage database with the tuning pragmas applied.
+
+        The connection is in autocommit mode; writes open their own transaction.
+        """
+        conn = sqlite3.connect(str(self.db_path), isolation_level=None, check_same_thread=False)
+        conn.executescript(_CONNECTION_PRAGMAS)
+        return conn
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._finalizer()
+
+    def __enter__(self) -> "Self":
+        """Use the tracker as a context manager that closes it on exit."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the database connection."""
+        self.close()
+
+    def _cursor(self) -> "contextlib.closing[sqlite3.Cursor]":
+        """Open a cursor on the shared connection that is closed after use."""
+        return contextlib.closing(self._conn.cursor())
+
     def _init_db(self) -> None:
         """Initialize the database schema."""
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
 
+        # The journal mode is stored in the database file, so it only needs setting once
+        cursor.execute("PRAGMA journal_mode=WAL")
+
+        cursor.execute(_CREATE_USAGE_TABLE)
+        self._migrate_text_timestamps()
+
+        # Reporting filters on time ranges and groups by provider and model; the
+        # second index also covers the summed columns, so grouping never reads the table
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_usage_ts ON usage(timestamp)")
         cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS usage (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT NOT NULL,
-                provider TEXT NOT NULL,
-                model TEXT NOT NULL,
-                tokens INTEGER NOT NULL,
-                cost REAL NOT NULL,
-                success INTEGER NOT NULL
-            )
-        """
+            "CREATE INDEX IF NOT EXISTS idx_usage_provider_model "
+            "ON usage(provider, model, tokens, cost)"
         )
 
-        conn.commit()
-        conn.close()
+        # Refresh planner statistics only when SQLite judges them stale
+        cursor.execute("PRAGMA optimize")
+
+    def _migrate_text_timestamps(self) -> None:
+        """Convert a usage table from ISO-8601 text timestamps to epoch integers.
+
+        Databases created by earlier versions stored ``datetime.isoformat()``
+        strings. The table is rebuilt once; its indexes are dropped with the
+        old table and recreated by ``_init_db``.
+        """
+        columns = {row[1]: row[2] for row in self._conn.execute("PRAGMA table_info(usage)")}
+        if columns.get("timestamp", "").upper() != "TEXT":
+            return
+
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("ALTER TABLE usage RENAME TO usage_old")
+            conn.execute(_CREATE_USAGE_TABLE)
+            rows = conn.execute(
+                "SELECT id, timestamp, provider, model, tokens, cost, success FROM usage_old"
+            ).fetchall()
+            conn.executemany(
+                "INSERT INTO usage (id, timestamp, provider, model, tokens, cost, success) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(r[0], _epoch_from_iso(r[1]), *r[2:]) for r in rows],
+            )
+            conn.execute("DROP TABLE usage_old")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
 
     def record_usage(
         self, provider: str, model: str, tokens: int, cost: float, success: bool = True
@@ -71,19 +185,68 @@ class UsageTracker:
             cost: Cost in USD
             success: Whether the request succeeded
         """
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
+        row = (int(time.time()), provider, model, tokens, cost, 1 if success else 0)
+        if self._pending is not None:
+            self._pending.append(row)
+        else:
+            self._insert([row])
 
-        cursor.execute(
-            """
-            INSERT INTO usage (timestamp, provider, model, tokens, cost, success)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """,
-            (datetime.now().isoformat(), provider, model, tokens, cost, 1 if success else 0),
+    def record_usage_many(self, records: Iterable[UsageRecord]) -> None:
+        """Record several usage events in a single transaction.
+
+        Args:
+            records: Usage records to store
+        """
+        self._insert(
+            [
+                (r.timestamp, r.provider, r.model, r.tokens, r.cost, 1 if r.success else 0)
+                for r in records
+            ]
         )
 
-        conn.commit()
-        conn.close()
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[None]:
+        """Buffer usage records and write them in a single transaction on exit.
+
+        Nested calls join the outermost batch. Buffered rows are written even
+        if the block raises, since the requests they describe were still made.
+        """
+        if self._pending is not None:
+            yield
+            return
+
+        self._pending = []
+        try:
+            yield
+        finally:
+            rows, self._pending = self._pending, None
+            if rows:
+                self._insert(rows)
+
+    def _insert(self, rows: List[_UsageRow]) -> None:
+        """Insert usage rows in one transaction.
+
+        Args:
+            rows: Rows to insert
+        """
+        if not rows:
+            return
+
+        conn = self._conn
+        with self._lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    """
+                    INSERT INTO usage (timestamp, provider, model, tokens, cost, success)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                    rows,
+                )
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
 
     def get_total_usage(self) -> Dict[str, Any]:
         """Get total usage statistics.
@@ -91,22 +254,17 @@ class UsageTracker:
         Returns:
             Dictionary with total stats
         """
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-            SELECT
-                COUNT(*) as total_requests,
-                SUM(tokens) as total_tokens,
-                SUM(cost) as total_cost,
-                SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END) as successful_requests
-            FROM usage
-        """
-        )
-
-        row = cursor.fetchone()
-        conn.close()
+        with self._cursor() as cursor:
+            cursor.execute("""
+                SELECT
+                    COUNT(*) as total_requests,
+                    SUM(tokens) as total_tokens,
+                    SUM(cost) as total_cost,
+                    SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END) as successful_requests
+                FROM usage
+            """)
+
+            row = cursor.fetchone()
 
         return {
             "total_requests": row[0] or 0,
@@ -121,27 +279,24 @@ class UsageTracker:
         Returns:
             Dictionary with monthly stats
         """
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-
-        # Get first day of current month
-        now = datetime.now()
-        first_day = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-
-        cursor.execute(
-            """
-            SELECT
-                COUNT(*) as total_requests,
-                SUM(tokens) as total_tokens,
-                SUM(cost) as total_cost
-            FROM usage
-            WHERE timestamp >= ?
-        """,
-            (first_day.isoformat(),),
-        )
+        with self._cursor() as cursor:
+            # Get first day of current month
+            now = datetime.now()
+            first_day = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+            cursor.execute(
+                """
+                SELECT
+                    COUNT(*) as total_requests,
+                    SUM(tokens) as total_tokens,
+                    SUM(cost) as total_cost
+                FROM usage
+                WHERE timestamp >= ?
+            """,
+                (int(first_day.timestamp()),),
+            )
 
-        row = cursor.fetchone()
-        conn.close()
+            row = cursor.fetchone()
 
         return {
             "month": now.strftime("%B %Y"),
@@ -156,25 +311,20 @@ class UsageTracker:
         Returns:
             List of provider statistics
         """
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-            SELECT
-                provider,
-                model,
-                COUNT(*) as requests,
-                SUM(tokens) as tokens,
-                SUM(cost) as cost
-            FROM usage
-            GROUP BY provider, model
-            ORDER BY cost DESC
-        """
-        )
-
-        rows = cursor.fetchall()
-        conn.close()
+        with self._cursor() as cursor:
+            cursor.execute("""
+                SELECT
+                    provider,
+                    model,
+                    COUNT(*) as requests,
+                    SUM(tokens) as tokens,
+                    SUM(cost) as cost
+                FROM usage
+                GROUP BY provider, model
+                ORDER BY cost DESC
+            """)
+
+            rows = cursor.fetchall()
 
         return [
             {
@@ -196,28 +346,25 @@ class UsageTracker:
         Returns:
             List of recent usage records
         """
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-
-        cutoff = datetime.now() - timedelta(days=days)
-
-        cursor.execute(
-            """
-            SELECT timestamp, provider, model, tokens, cost, success
-            FROM usage
-            WHERE timestamp >= ?
-            ORDER BY timestamp DESC
-            LIMIT 50
-        """,
-            (cutoff.isoformat(),),
-        )
+        with self._cursor() as cursor:
+            cutoff = datetime.now() - timedelta(days=days)
+
+            cursor.execute(
+                """
+                SELECT timestamp, provider, model, tokens, cost, success
+                FROM usage
+                WHERE timestamp >= ?
+                ORDER BY timestamp DESC
+                LIMIT 50
+            """,
+                (int(cutoff.timestamp()),),
+            )
 
-        rows = cursor.fetchall()
-        conn.close()
+            rows = cursor.fetchall()
 
         return [
             {
-                "timestamp": row[0],
+                "timestamp": datetime.fromtimestamp(row[0]).isoformat(),
                 "provider": row[1],
                 "model": row[2],
                 "tokens": row[3],
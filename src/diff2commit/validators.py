@@ -3,24 +3,67 @@
 import re
 from typing import Tuple, List, Optional
 
+_CONVENTIONAL_TYPES = (
+    "feat",
+    "fix",
+    "docs",
+    "style",
+    "refactor",
+    "perf",
+    "test",
+    "build",
+    "ci",
+    "chore",
+    "revert",
+)
+
+_CONVENTIONAL_TYPES_SET = frozenset(_CONVENTIONAL_TYPES)
+# Only the optional scope needs a regex; the type itself is a set lookup
+_SCOPE_RE = re.compile(r"\([a-z0-9-]+\)")
+_PAST_TENSE_RE = re.compile(r"^\w+(\([^)]+\))?: (added|fixed|changed|updated)", re.IGNORECASE)
+_BREAKING_RE = re.compile(r"BREAKING CHANGE: (.+?)(?:\n|$)", re.MULTILINE)
+_BREAKING_SUBJECT_RE = re.compile(r"^\w+!(?:\(|:)")
+
+# One alternation classifies the diff in a single pass; group names are commit types.
+# The lookahead keeps matches zero-width so one keyword cannot hide another it overlaps.
+_SUGGEST_RE = re.compile(
+    r"(?=(?P<test>test_|_test\.|spec\.)"
+    r"|(?P<docs>readme|doc|comment)"
+    r"|(?P<build>package\.json|requirements|setup\.py|dockerfile)"
+    r"|(?P<ci>\.github/workflows|\.gitlab-ci)"
+    r"|(?P<fix>fix|bug|issue|error|crash))",
+    re.IGNORECASE,
+)
+
+# Suggested type when several match, highest priority first
+_SUGGEST_PRIORITY = ("test", "docs", "build", "ci", "fix")
+
+
+def _is_conventional_subject(subject: str) -> bool:
+    """Check that a subject reads ``<type>(<scope>): <description>``.
+
+    Args:
+        subject: First line of the commit message
+
+    Returns:
+        True if the type is known, the optional scope is well formed and a
+        description follows ": "
+    """
+    head, sep, rest = subject.partition(":")
+    if not sep or len(rest) < 2 or rest[0] != " ":
+        return False
+
+    commit_type, paren, scope = head.partition("(")
+    if commit_type not in _CONVENTIONAL_TYPES_SET:
+        return False
+    return not paren or _SCOPE_RE.fullmatch(paren + scope) is not None
+
 
 class CommitMessageValidator:
     """Validate commit messages against various standards."""
 
     # Conventional Commits types
-    CONVENTIONAL_TYPES = [
-        "feat",
-        "fix",
-        "docs",
-        "style",
-        "refactor",
-        "perf",
-        "test",
-        "build",
-        "ci",
-        "chore",
-        "revert",
-    ]
+    CONVENTIONAL_TYPES = list(_CONVENTIONAL_TYPES)
 
     def __init__(self, max_subject_length: int = 72):
         """Initialize validator.
@@ -40,7 +83,7 @@ class CommitMessageValidator:
             Tuple of (is_valid, list_of_errors)
         """
         errors = []
-        lines = message.split("\\n")
+        lines = message.splitlines()
 
         if not lines:
             return False, ["Message is empty"]
@@ -48,8 +91,7 @@ class CommitMessageValidator:
         subject = lines[0]
 
         # Check type prefix
-        type_pattern = r"^(" + "|".join(self.CONVENTIONAL_TYPES) + r")(\\([a-z0-9-]+\\))?: .+"
-        if not re.match(type_pattern, subject):
+        if not _is_conventional_subject(subject):
             errors.append(
                 f"Subject must start with a valid type: {', '.join(self.CONVENTIONAL_TYPES)}"
             )
@@ -63,9 +105,7 @@ class CommitMessageValidator:
             errors.append("Subject should not end with a period")
 
         # Check for imperative mood (basic check)
-        if re.match(
-            r"^(\\w+)(\\([^)]+\\))?: (added|fixed|changed|updated)", subject, re.IGNORECASE
-        ):
+        if _PAST_TENSE_RE.match(subject):
             errors.append("Use imperative mood (add, fix, change) not past tense")
 
         # Check blank line after subject if body exists
@@ -95,14 +135,22 @@ class CommitMessageValidator:
         Returns:
             Tuple of (all_valid, list_of_invalid_line_numbers)
         """
-        lines = body.split("\\n")
-        invalid_lines = []
+        invalid_lines = [
+            i for i, line in enumerate(body.splitlines(), start=1) if len(line) > max_length
+        ]
+        return not invalid_lines, invalid_lines
+
+    def is_body_valid(self, body: str, max_length: int = 100) -> bool:
+        """Check body line lengths, stopping at the first line that is too long.
 
-        for i, line in enumerate(lines, start=1):
-            if len(line) > max_length:
-                invalid_lines.append(i)
+        Args:
+            body: Message body
+            max_length: Maximum line length
 
-        return len(invalid_lines) == 0, invalid_lines
+        Returns:
+            True if every line fits
+        """
+        return all(len(line) <= max_length for line in body.splitlines())
 
     def extract_breaking_changes(self, message: str) -> Optional[str]:
         """Extract breaking change information from message.
@@ -114,14 +162,13 @@ class CommitMessageValidator:
             Breaking change description or None
         """
         # Check for BREAKING CHANGE in footer
-        pattern = r"BREAKING CHANGE: (.+?)(?:\\n|$)"
-        match = re.search(pattern, message, re.MULTILINE)
+        match = _BREAKING_RE.search(message)
 
         if match:
             return match.group(1)
 
         # Check for ! in type
-        if re.match(r"^\\w+!\\(", message) or re.match(r"^\\w+!:", message):
+        if _BREAKING_SUBJECT_RE.match(message):
             return "Breaking change indicated in subject"
 
         return None
@@ -135,27 +182,12 @@ class CommitMessageValidator:
         Returns:
             Suggested commit type
         """
-        diff_lower = diff.lower()
-
-        # Check for test files
-        if re.search(r"test_|_test\\.|spec\\.", diff_lower):
-            return "test"
-
-        # Check for documentation
-        if re.search(r"readme|doc|comment", diff_lower):
-            return "docs"
-
-        # Check for configuration/build files
-        if re.search(r"package\\.json|requirements|setup\\.py|dockerfile", diff_lower):
-            return "build"
-
-        # Check for CI files
-        if re.search(r"\\.github/workflows|\\.gitlab-ci", diff_lower):
-            return "ci"
-
-        # Check for bug-related keywords
-        if re.search(r"fix|bug|issue|error|crash", diff_lower):
-            return "fix"
+        found = set()
+        for match in _SUGGEST_RE.finditer(diff):
+            kind = match.lastgroup
+            if kind == _SUGGEST_PRIORITY[0]:
+                return kind
+            found.add(kind)
 
         # Default to feat
-        return "feat"
+        return next((kind for kind in _SUGGEST_PRIORITY if kind in found), "feat")
@@ -1,19 +1,77 @@
 """Pytest configuration and fixtures."""
 
+import os
 import pytest
 import shutil
+import subprocess
+import sys
+import tempfile
 import git
 from pathlib import Path
 from typing import Iterator
 
-from diff2commit.config import Diff2CommitConfig
-
-
-@pytest.fixture
-def temp_git_repo(tmp_path: Path) -> Iterator[Path]:
-    """Create a temporary Git repository for testing."""
-    repo_path = tmp_path / "test_repo"
-    repo_path.mkdir()
+from diff2commit.config import Diff2CommitConfig, load_config
+
+
+@pytest.fixture(autouse=True)
+def _fresh_config() -> Iterator[None]:
+    """Clear the cached configuration so each test sees its own environment."""
+    load_config.cache_clear()
+    yield
+    load_config.cache_clear()
+
+
+# Applied to every git process the tests start. Test repositories are
+# throwaway, so skip fsync barriers, background gc and commit signing.
+_GIT_TEST_CONFIG = {
+    "core.fsync": "none",
+    "core.fsyncMethod": "batch",
+    "core.fsyncObjectFiles": "false",
+    "gc.auto": "0",
+    "commit.gpgsign": "false",
+    "tag.gpgsign": "false",
+}
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _fast_git_config() -> Iterator[None]:
+    """Pass the test git settings to every git process through GIT_CONFIG_* variables."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("GIT_CONFIG_COUNT", str(len(_GIT_TEST_CONFIG)))
+        for i, (key, value) in enumerate(_GIT_TEST_CONFIG.items()):
+            mp.setenv(f"GIT_CONFIG_KEY_{i}", key)
+            mp.setenv(f"GIT_CONFIG_VALUE_{i}", value)
+        yield
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """Hardlink git objects, which are never modified in place, and copy everything else."""
+    if f"{os.sep}objects{os.sep}" in src:
+        os.link(src, dst)
+    else:
+        shutil.copy2(src, dst)
+
+
+@pytest.fixture(scope="session")
+def _git_tmp_root(tmp_path_factory: pytest.TempPathFactory) -> Iterator[Path]:
+    """Directory for test repositories, on tmpfs where available.
+
+    Git writes many small files and fsyncs them; on /dev/shm they stay in memory.
+    """
+    shm = Path("/dev/shm")
+    if sys.platform == "linux" and os.access(shm, os.W_OK):
+        root = Path(tempfile.mkdtemp(prefix="diff2commit-tests-", dir=shm))
+        yield root
+        shutil.rmtree(root, ignore_errors=True)
+    else:
+        yield tmp_path_factory.mktemp("git")
+
+
+@pytest.fixture(scope="session")
+def _git_repo_template(_git_tmp_root: Path) -> Path:
+    """Create a Git repository with one commit, shared as a template by every test."""
+    repo_path = _git_tmp_root / "template" / "test_repo"
+    repo_path.mkdir(parents=True)
 
     # Initialize git repo
     repo = git.Repo.init(repo_path)
@@ -28,11 +86,87 @@ def temp_git_repo(tmp_path: Path) -> Iterator[Path]:
     test_file.write_text("# Test Repository")
     repo.index.add(["README.md"])
     repo.index.commit("Initial commit")
+    repo.close()
+
+    return repo_path
+
+
+@pytest.fixture(scope="session")
+def _large_git_repo_template(_git_repo_template: Path, _git_tmp_root: Path) -> Path:
+    """Create a repository with 5 000 committed files, built once when a slow test needs it."""
+    repo_path = _git_tmp_root / "large_template" / "test_repo"
+    shutil.copytree(_git_repo_template, repo_path, copy_function=_link_or_copy)
+
+    for i in range(5000):
+        module = repo_path / "src" / f"pkg_{i // 100}" / f"module_{i}.py"
+        module.parent.mkdir(parents=True, exist_ok=True)
+        module.write_text(f"VALUE = {i}\n")
+    subprocess.run(["git", "-C", str(repo_path), "add", "--all"], check=True)
+    subprocess.run(
+        ["git", "-C", str(repo_path), "commit", "--quiet", "-m", "Add modules"], check=True
+    )
+
+    return repo_path
+
+
+def _copy_repo(template: Path, root: Path) -> Path:
+    """Copy a template repository into a new directory under ``root``.
 
-    yield repo_path
+    Args:
+        template: Repository to copy
+        root: Directory on the same filesystem as the template
+
+    Returns:
+        Directory holding the copy in its ``test_repo`` subdirectory
+    """
+    # Same filesystem as the template, so its objects can be hardlinked
+    test_dir = Path(tempfile.mkdtemp(dir=root))
+    shutil.copytree(template, test_dir / "test_repo", copy_function=_link_or_copy)
+    return test_dir
+
+
+@pytest.fixture
+def temp_git_repo(_git_repo_template: Path, _git_tmp_root: Path) -> Iterator[Path]:
+    """Create a temporary Git repository for testing, copied from the session template."""
+    test_dir = _copy_repo(_git_repo_template, _git_tmp_root)
+
+    yield test_dir / "test_repo"
 
     # Cleanup
-    shutil.rmtree(repo_path, ignore_errors=True)
+    shutil.rmtree(test_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def large_git_repo(_large_git_repo_template: Path, _git_tmp_root: Path) -> Iterator[Path]:
+    """Create a temporary repository with 5 000 committed files."""
+    test_dir = _copy_repo(_large_git_repo_template, _git_tmp_root)
+
+    yield test_dir / "test_repo"
+
+    shutil.rmtree(test_dir, ignore_errors=True)
+
+
+@pytest.fixture(params=["subprocess", "gitpython"])
+def git_backend(request: pytest.FixtureRequest) -> str:
+    """Tool that writes the index in staged-repository tests.
+
+    GitOperations reads the index with the git CLI, so it must agree with
+    whatever wrote it: the git CLI for most users, GitPython for some scripts.
+    """
+    return str(request.param)
+
+
+@pytest.fixture
+def staged_repo(temp_git_repo: Path, git_backend: str) -> Path:
+    """Temporary Git repository with one new file staged."""
+    (temp_git_repo / "new_file.txt").write_text("New content")
+    if git_backend == "gitpython":
+        repo = git.Repo(temp_git_repo)
+        repo.index.add(["new_file.txt"])
+        repo.close()
+    else:
+        subprocess.run(["git", "-C", str(temp_git_repo), "add", "--", "new_file.txt"], check=True)
+    return temp_git_repo
 
 
 @pytest.fixture
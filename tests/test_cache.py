@@ -0,0 +1,165 @@
+"""Tests for the response cache."""
+
+from pathlib import Path
+from typing import Dict, Iterator, List
+from unittest.mock import patch
+
+import pytest
+from openai.types.chat import ChatCompletion
+
+from diff2commit.ai_providers.base import CommitMessage
+from diff2commit.ai_providers.openai_provider import OpenAIProvider
+from diff2commit.cache import LLMCache, SemanticCache
+from diff2commit.config import Diff2CommitConfig
+
+
+def test_cache_roundtrip(tmp_path: Path) -> None:
+    """Test storing and retrieving a commit message."""
+    cache = LLMCache(tmp_path / "llm_cache")
+    key = cache.make_key("OpenAIProvider", "gpt-4", "system", "prompt", 0.7, 200)
+    message = CommitMessage(subject="feat: add cache", tokens_used=42, provider="openai")
+
+    assert cache.get(key) is None
+
+    cache.put(key, message)
+    cached = cache.get(key)
+
+    assert cached is not None
+    assert cached.subject == "feat: add cache"
+    assert cached.tokens_used == 42
+    assert cached.timestamp == message.timestamp
+    assert list((tmp_path / "llm_cache").glob("*.tmp")) == []
+
+
+def test_cache_key_depends_on_all_parts() -> None:
+    """Test that changing any request parameter changes the key."""
+    base = LLMCache.make_key("OpenAIProvider", "gpt-4", "system", "prompt", 0.7, 200)
+
+    assert base != LLMCache.make_key("OpenAIProvider", "gpt-4", "system", "prompt", 0.8, 200)
+    assert base != LLMCache.make_key("OpenAIProvider", "gpt-4", "system", "other", 0.7, 200)
+    assert len(base) == 64
+
+
+def test_cache_ignores_corrupt_entries(tmp_path: Path) -> None:
+    """Test that unreadable entries are treated as misses."""
+    cache = LLMCache(tmp_path)
+    (tmp_path / "deadbeef.json").write_text("{not json")
+
+    assert cache.get("deadbeef") is None
+
+
+def _completion(content: str) -> ChatCompletion:
+    """Build a single-choice chat completion that used 100 tokens."""
+    return ChatCompletion.model_validate(
+        {
+            "id": "c",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "gpt-4",
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": content},
+                }
+            ],
+            "usage": {"prompt_tokens": 90, "completion_tokens": 10, "total_tokens": 100},
+        }
+    )
+
+
+def test_cache_hit_reports_no_usage(tmp_path: Path, mock_config: Diff2CommitConfig) -> None:
+    """Test that a repeated request is served from the cache without cost."""
+    config = mock_config.model_copy(update={"enable_cache": True, "cache_dir": tmp_path})
+    provider = OpenAIProvider(config)
+    response = _completion("feat: add cache")
+
+    with patch.object(provider.client.chat.completions, "create", return_value=response) as create:
+        first = provider.generate_commit_message("diff", {})
+        second = provider.generate_commit_message("diff", {})
+
+    create.assert_called_once()
+    assert (first.tokens_used, first.cached) == (100, False)
+    assert first.cost > 0
+    assert second.subject == first.subject
+    assert (second.tokens_used, second.cost, second.cached) == (0, 0.0, True)
+
+
+def test_stream_cache_hit_replays_text_and_skip_cache_refetches(
+    tmp_path: Path, mock_config: Diff2CommitConfig
+) -> None:
+    """Test that a streamed cache hit reports its text and skip_cache reaches the API."""
+    config = mock_config.model_copy(update={"enable_cache": True, "cache_dir": tmp_path})
+    provider = OpenAIProvider(config)
+    responses = [_completion("feat: first"), _completion("feat: second")]
+
+    seen: List[str] = []
+    with patch.object(provider.client.chat.completions, "create", side_effect=responses):
+        provider.generate_commit_message("diff", {})
+        hit = provider.stream_commit_message("diff", {}, seen.append)
+        with provider.skip_cache():
+            fresh = provider.generate_commit_message("diff", {})
+
+    assert hit.cached
+    assert seen == ["feat: first"]
+    assert (fresh.subject, fresh.cached) == ("feat: second", False)
+    # The bypassed response is not stored either
+    assert provider.generate_commit_message("diff", {}).subject == "feat: first"
+
+
+class _StubEmbedding:
+    """Embedding model returning fixed vectors, in fastembed's ``embed`` interface."""
+
+    def __init__(self, vectors: Dict[str, List[float]]):
+        self.vectors = vectors
+
+    def embed(self, texts: List[str]) -> Iterator[List[float]]:
+        return (self.vectors[text] for text in texts)
+
+
+@pytest.fixture
+def semantic_cache(tmp_path: Path) -> SemanticCache:
+    """Semantic cache over a stub embedder, with one entry indexed under ``scope``."""
+    pytest.importorskip("numpy")
+    model = _StubEmbedding(
+        {
+            "stored": [1.0, 0.0, 0.0],
+            # Cosine similarity ~0.95 and ~0.5 to "stored"
+            "similar": [0.95, 0.31, 0.0],
+            "different": [0.5, 0.87, 0.0],
+        }
+    )
+    cache = SemanticCache(LLMCache(tmp_path), threshold=0.92, embedding_model=model)
+    cache.exact_cache.put("key", CommitMessage(subject="feat: stored"))
+    cache.put("stored", "scope", "key")
+    return cache
+
+
+def test_semantic_cache_threshold(semantic_cache: SemanticCache) -> None:
+    """Test that only prompts above the similarity threshold hit."""
+    hit = semantic_cache.get("similar", "scope")
+
+    assert hit is not None
+    assert hit.subject == "feat: stored"
+    assert semantic_cache.get("different", "scope") is None
+
+
+def test_semantic_cache_scope(semantic_cache: SemanticCache) -> None:
+    """Test that entries are only matched within their provider/model scope."""
+    assert semantic_cache.get("stored", "other") is None
+
+
+def test_semantic_cache_skips_mismatched_entries(semantic_cache: SemanticCache) -> None:
+    """Test that entries whose vector does not match the key are ignored."""
+    index = semantic_cache.index_path
+    good = index.read_text()
+    # A vector cut short by an interrupted write, and a line without its key
+    index.write_text(
+        '{"key": "key", "scope": "scope", "vector": "AACAPw=="}\n'
+        '{"scope": "scope", "vector": "AACAPwAAAAAAAAAA"}\n'
+    )
+
+    assert semantic_cache.get("stored", "scope") is None
+
+    index.write_text(index.read_text() + good)
+    assert semantic_cache.get("stored", "scope") is not None
@@ -1,6 +1,7 @@
 """Tests for configuration management."""
 
 import pytest
+from pydantic import ValidationError
 from pytest import MonkeyPatch
 
 from diff2commit.config import Diff2CommitConfig, load_config
@@ -37,3 +38,14 @@ def test_config_validation() -> None:
     # Invalid temperature should raise validation error
     with pytest.raises(Exception):
         Diff2CommitConfig(api_key="test", temperature=3.0)
+
+
+def test_config_is_frozen() -> None:
+    """Test that the shared config cannot be mutated and overrides go through copies."""
+    config = load_config()
+    with pytest.raises(ValidationError):
+        config.ai_model = "other"  # type: ignore[misc]
+
+    override = config.model_copy(update={"ai_model": "other"})
+    assert override.ai_model == "other"
+    assert load_config().ai_model == config.ai_model
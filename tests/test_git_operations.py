@@ -1,71 +1,243 @@
 """Tests for Git operations."""
 
+import os
+import subprocess
+import time
 from pathlib import Path
+from unittest.mock import PropertyMock, patch
+
 import pytest
-import git
 
-from git.exc import InvalidGitRepositoryError
+from git.exc import GitCommandError, InvalidGitRepositoryError
 
 from diff2commit.git_operations import GitOperations
 
 
 def test_git_operations_init(temp_git_repo: Path) -> None:
     """Test GitOperations initialization."""
-    git_ops = GitOperations(str(temp_git_repo))
+    git_ops = GitOperations(temp_git_repo)
     assert git_ops.repo is not None
 
 
 def test_git_operations_invalid_repo() -> None:
-    """Test GitOperations with invalid repository."""
-    with pytest.raises(InvalidGitRepositoryError):
+    """Test that a nonexistent path is rejected before any repository lookup."""
+    with patch("diff2commit.git_operations.git.Repo") as repo, pytest.raises(
+        InvalidGitRepositoryError
+    ):
         GitOperations("/nonexistent/path")
 
+    repo.assert_not_called()
+
 
 def test_get_staged_diff_empty(temp_git_repo: Path) -> None:
-    """Test getting diff with no staged changes."""
-    git_ops = GitOperations(str(temp_git_repo))
-    diff_summary = git_ops.get_staged_diff()
+    """Test that an empty index is detected without reading a patch."""
+    git_ops = GitOperations(temp_git_repo)
+
+    with patch.object(git_ops, "_read_git_bounded") as read_patch:
+        diff_summary = git_ops.get_staged_diff()
+
     assert diff_summary.is_empty is True
+    read_patch.assert_not_called()
 
 
-def test_get_staged_diff_with_changes(temp_git_repo: Path) -> None:
+def test_get_staged_diff_with_changes(staged_repo: Path) -> None:
     """Test getting diff with staged changes."""
-    # Create and stage a new file
-    test_file = temp_git_repo / "new_file.txt"
-    test_file.write_text("New content")
+    diff_summary = GitOperations(staged_repo).get_staged_diff()
+
+    assert diff_summary.is_empty is False
+    assert "new_file.txt" in diff_summary.files_changed
+    assert diff_summary.change_types["new_file.txt"] == "A"
+    assert diff_summary.additions == 1
+    assert diff_summary.deletions == 0
+
+
+def test_get_staged_files_reads_no_patch(staged_repo: Path) -> None:
+    """Test that listing staged files uses git's statistics without reading a patch."""
+    git_ops = GitOperations(staged_repo)
+
+    with patch.object(git_ops, "_read_git_bounded") as read_patch:
+        changes = git_ops.get_staged_files()
+
+    read_patch.assert_not_called()
+    assert [(c.path, c.status, c.added, c.deleted) for c in changes] == [
+        ("new_file.txt", "A", 1, 0)
+    ]
+
+
+@pytest.mark.parametrize("count", [1, 100, 10_000])
+def test_stage_many_files_in_one_call(temp_git_repo: Path, count: int) -> None:
+    """Test that staging any number of files runs git once."""
+    paths = [f"file_{i}.txt" for i in range(count)]
+    for path in paths:
+        (temp_git_repo / path).write_text(path)
+    git_ops = GitOperations(temp_git_repo)
+
+    with patch("diff2commit.git_operations.subprocess.run", wraps=subprocess.run) as run:
+        git_ops.stage(paths)
 
-    repo = git.Repo(temp_git_repo)
-    repo.index.add(["new_file.txt"])
+    assert run.call_count == 1
+    assert len(git_ops.get_staged_files()) == count
+
+
+def test_stage_treats_paths_literally(temp_git_repo: Path) -> None:
+    """Test that glob characters and magic prefixes in file names stage only those files."""
+    for name in ("x[12].txt", "x1.txt", ":ab.txt", "ab.txt"):
+        (temp_git_repo / name).write_text(name)
+    git_ops = GitOperations(temp_git_repo)
+
+    git_ops.stage(["x[12].txt", ":ab.txt"])
+
+    staged = sorted(change.path for change in git_ops.get_staged_files())
+    assert staged == [":ab.txt", "x[12].txt"]
+
+
+def test_get_staged_diff_rename_and_binary(temp_git_repo: Path) -> None:
+    """Test that renames report the new path and binary files count no lines."""
+    git_ops = GitOperations(temp_git_repo)
+    git_ops.repo.git.mv("README.md", "DOCS.md")
+    (temp_git_repo / "image.bin").write_bytes(b"\x00\x01\x02")
+    git_ops.stage(["image.bin"])
 
-    git_ops = GitOperations(str(temp_git_repo))
     diff_summary = git_ops.get_staged_diff()
 
-    assert diff_summary.is_empty is False
-    assert "new_file.txt" in diff_summary.files_changed
-    assert diff_summary.additions > 0
+    assert sorted(diff_summary.files_changed) == ["DOCS.md", "image.bin"]
+    assert diff_summary.change_types["DOCS.md"] == "R"
+    assert diff_summary.change_types["image.bin"] == "A"
+    assert diff_summary.additions == 0
+    assert diff_summary.deletions == 0
 
 
-def test_commit_changes(temp_git_repo: Path) -> None:
-    """Test committing changes."""
-    # Create and stage a file
-    test_file = temp_git_repo / "commit_test.txt"
-    test_file.write_text("Test commit")
+def test_get_staged_diff_bounded_read(temp_git_repo: Path) -> None:
+    """Test that large patches are cut at a line boundary within the byte limit."""
+    (temp_git_repo / "big.txt").write_text("".join(f"line {i}\n" for i in range(10000)))
+    git_ops = GitOperations(temp_git_repo, max_diff_bytes=1024)
+    git_ops.stage(["big.txt"])
+
+    diff_summary = git_ops.get_staged_diff()
+
+    assert diff_summary.truncated is True
+    assert len(diff_summary.diff_text) <= 1024
+    assert diff_summary.diff_text.endswith("\n")
+    assert diff_summary.additions == 10000
+
+
+def test_has_staged_changes(temp_git_repo: Path) -> None:
+    """Test the staged-changes check before and after committing."""
+    git_ops = GitOperations(temp_git_repo)
+    assert git_ops.has_staged_changes() is False
 
-    repo = git.Repo(temp_git_repo)
-    repo.index.add(["commit_test.txt"])
+    (temp_git_repo / "staged.txt").write_text("staged")
+    git_ops.stage(["staged.txt"])
+    assert git_ops.has_staged_changes() is True
+    assert git_ops.get_staged_diff().files_changed == ["staged.txt"]
 
-    git_ops = GitOperations(str(temp_git_repo))
+    git_ops.commit_changes("test: add staged file")
+    assert git_ops.has_staged_changes() is False
+    assert git_ops.get_staged_diff().is_empty is True
+
+
+def test_has_staged_changes_raises_on_git_failure(temp_git_repo: Path) -> None:
+    """Test that a git error is reported instead of being read as nothing staged."""
+    git_ops = GitOperations(temp_git_repo)
+    (temp_git_repo / ".git" / "index").write_bytes(b"not an index")
+
+    with pytest.raises(GitCommandError):
+        git_ops.has_staged_changes()
+
+
+def test_commit_changes(staged_repo: Path) -> None:
+    """Test committing changes."""
+    git_ops = GitOperations(staged_repo)
     commit_sha = git_ops.commit_changes("test: add test file")
 
     assert commit_sha is not None
     assert len(commit_sha) == 40  # SHA-1 hash length
 
 
+def test_commit_changes_runs_one_commit(staged_repo: Path) -> None:
+    """Test that committing runs git commit once and only reads HEAD afterwards."""
+    git_ops = GitOperations(staged_repo)
+
+    with patch("diff2commit.git_operations.subprocess.run", wraps=subprocess.run) as run:
+        commit_sha = git_ops.commit_changes("test: add test file")
+
+    subcommands = [call.args[0][len(git_ops._git_cmd)] for call in run.call_args_list]
+    assert subcommands == ["commit", "rev-parse"]
+    assert git_ops.repo.head.commit.hexsha == commit_sha
+
+
 def test_get_repo_info(temp_git_repo: Path) -> None:
     """Test getting repository information."""
-    git_ops = GitOperations(str(temp_git_repo))
+    git_ops = GitOperations(temp_git_repo)
     repo_info = git_ops.get_repo_info()
 
     assert "branch" in repo_info
     assert "remote" in repo_info
     assert "root" in repo_info
+
+
+def test_get_repo_info_is_cached_until_head_changes(temp_git_repo: Path) -> None:
+    """Test that repository info is read once and refreshed when HEAD is rewritten."""
+    git_ops = GitOperations(temp_git_repo)
+    branch = PropertyMock(return_value=git_ops.repo.active_branch)
+
+    with patch.object(type(git_ops.repo), "active_branch", branch):
+        first = git_ops.get_repo_info()
+        assert git_ops.get_repo_info() is first
+        assert branch.call_count == 1
+
+        head = temp_git_repo / ".git" / "HEAD"
+        stat = head.stat()
+        os.utime(head, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        git_ops.get_repo_info()
+        assert branch.call_count == 2
+
+
+def test_get_repo_info_in_linked_worktree(temp_git_repo: Path) -> None:
+    """Test that repository info works where the git dir has no config of its own."""
+    worktree = temp_git_repo.parent / "worktree"
+    subprocess.run(
+        ["git", "-C", str(temp_git_repo), "worktree", "add", "-q", "-b", "side", str(worktree)],
+        check=True,
+    )
+    git_ops = GitOperations(worktree)
+
+    repo_info = git_ops.get_repo_info()
+
+    assert repo_info["branch"] == "side"
+    assert git_ops.get_repo_info() is repo_info
+
+
+def test_get_staged_diff_summarizes_generated_files(temp_git_repo: Path) -> None:
+    """Test that binary and generated files are summarized instead of included."""
+    (temp_git_repo / "main.py").write_text("print('hi')\n")
+    (temp_git_repo / "yarn.lock").write_text("".join(f"pkg{i}@1.0.0\n" for i in range(50)))
+    (temp_git_repo / "image.bin").write_bytes(b"\x00\x01\x02")
+    git_ops = GitOperations(temp_git_repo)
+    git_ops.stage(["main.py", "yarn.lock", "image.bin"])
+
+    diff_summary = git_ops.get_staged_diff()
+
+    assert "<skipped: yarn.lock (+50 -0)>" in diff_summary.diff_text
+    assert "<binary: image.bin>" in diff_summary.diff_text
+    assert "pkg0@1.0.0" not in diff_summary.diff_text
+    assert "print('hi')" in diff_summary.diff_text
+    assert diff_summary.additions == 51
+    assert len(diff_summary.files_changed) == 3
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(os.getenv("SLOW_TESTS") != "1", reason="set SLOW_TESTS=1 to run")
+def test_get_staged_diff_scales_with_changes_not_repo_size(large_git_repo: Path) -> None:
+    """Test that a small change in a 5 000-file repository is summarized quickly."""
+    (large_git_repo / "src" / "pkg_0" / "module_0.py").write_text("VALUE = -1\n")
+    (large_git_repo / "CHANGES.md").write_text("- Change module 0\n")
+    git_ops = GitOperations(large_git_repo)
+    git_ops.stage(["src/pkg_0/module_0.py", "CHANGES.md"])
+
+    start = time.perf_counter()
+    diff_summary = git_ops.get_staged_diff()
+    elapsed = time.perf_counter() - start
+
+    assert sorted(diff_summary.files_changed) == ["CHANGES.md", "src/pkg_0/module_0.py"]
+    assert elapsed < 0.2
@@ -0,0 +1,21 @@
+"""Tests for the console entry point."""
+
+import subprocess
+import sys
+
+from diff2commit.__version__ import __version__
+
+
+def test_version_skips_cli_import() -> None:
+    """Test that a bare ``version`` is answered without importing the Typer app."""
+    script = (
+        "import sys; sys.argv = ['diff2commit', 'version'];"
+        "from diff2commit.__main__ import main; main();"
+        "print('diff2commit.cli' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+
+    assert f"diff2commit version {__version__}" in result.stdout
+    assert result.stdout.strip().endswith("False")
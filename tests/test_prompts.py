@@ -0,0 +1,116 @@
+"""Tests for prompt building."""
+
+from unittest.mock import patch
+
+import pytest
+
+from diff2commit.prompts import (
+    CUSTOM_TEMPLATES,
+    build_commit_prompt,
+    build_commit_prompt_cached,
+    build_custom_prompt,
+    truncate_diff,
+)
+from diff2commit.summaries import build_file_summary
+
+
+def _file_diff(name: str, lines: int) -> str:
+    body = "".join(f"+line {i}\n" for i in range(lines))
+    return (
+        f"diff --git a/{name} b/{name}\n"
+        f"--- a/{name}\n"
+        f"+++ b/{name}\n"
+        f"@@ -0,0 +1,{lines} @@\n"
+        f"{body}"
+    )
+
+
+def test_truncate_diff_keeps_small_diff(sample_diff: str) -> None:
+    """Test that a diff within budget is returned unchanged."""
+    assert truncate_diff(sample_diff, 10_000) == sample_diff
+
+
+def test_truncate_diff_keeps_every_file() -> None:
+    """Test that a large file does not crowd out smaller ones."""
+    small = _file_diff("small.py", 3)
+    large = _file_diff("vendor/big.js", 5000)
+
+    result = truncate_diff(large + small, 2000)
+
+    assert len(result) <= 2000
+    assert small in result
+    assert "diff --git a/vendor/big.js b/vendor/big.js" in result
+    assert "... [truncated " in result
+
+
+@pytest.mark.parametrize("max_chars", [500, 3000, 12_000])
+def test_truncate_diff_stays_within_budget_for_many_files(max_chars: int) -> None:
+    """Test that per-file headers and markers cannot push a many-file diff over budget."""
+    diff = "".join(_file_diff(f"src/pkg/module_{i}.py", 40) for i in range(200))
+
+    result = truncate_diff(diff, max_chars)
+
+    assert len(result) <= max_chars
+    shown = result.count("diff --git ")
+    assert result.endswith(f"... and {200 - shown} more files\n")
+    assert result.startswith("diff --git a/src/pkg/module_0.py")
+
+
+def test_build_commit_prompt_uses_real_newlines(sample_diff: str) -> None:
+    """Test that the prompt contains no literal backslash-n sequences."""
+    prompt = build_commit_prompt(
+        diff=sample_diff,
+        files_changed=["src/main.py", "README.md"],
+        additions=4,
+        deletions=1,
+        change_types={"src/main.py": "M", "README.md": "M"},
+        include_emoji=True,
+    )
+
+    assert "\\n" not in prompt
+    assert "  M src/main.py\n  M README.md\n" in prompt
+
+
+def test_build_custom_prompt_matches_format() -> None:
+    """Test that pre-parsed and fallback templates render exactly like str.format."""
+    context = {
+        "files_changed": ["a.py", "b.py"],
+        "additions": 3,
+        "deletions": 1,
+        "ticket_id": "X-1",
+    }
+    values = {
+        "diff": "+x",
+        "files": "a.py, b.py",
+        "additions": 3,
+        "deletions": 1,
+        "ticket_id": "X-1",
+    }
+
+    # Plain fields use the parsed path; the format spec forces the str.format fallback
+    for template in (CUSTOM_TEMPLATES["jira"] + "{{literal}}", "{additions:>4} {files}"):
+        assert build_custom_prompt("+x", template, context) == template.format(**values)
+
+
+def test_prebuilt_file_summary_matches_inline_summary(sample_diff: str) -> None:
+    """Test that passing a shared file summary renders the same prompt."""
+    files = [f"src/module_{i}.py" for i in range(25)]
+    change_types = {files[0]: "A", files[1]: "D"}
+    summary = build_file_summary(files, change_types)
+
+    assert len(summary.table_rows) == 21
+    assert build_commit_prompt(
+        sample_diff, files, 5, 2, change_types, summary=summary
+    ) == build_commit_prompt(sample_diff, files, 5, 2, change_types)
+
+
+def test_cached_prompt_is_reused_for_the_same_diff(sample_diff: str) -> None:
+    """Test that a repeated diff returns the cached prompt without rebuilding it."""
+    args = (sample_diff, ["src/main.py"], 3, 1, {"src/main.py": "M"})
+    first = build_commit_prompt_cached(*args)
+
+    with patch("diff2commit.prompts.build_commit_prompt") as build:
+        assert build_commit_prompt_cached(*args) is first
+        build.assert_not_called()
+
+    assert build_commit_prompt_cached(*args, include_emoji=True) != first
@@ -0,0 +1,247 @@
+"""Tests for shared provider behaviour."""
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, List, Optional
+from unittest.mock import Mock, patch
+
+import pytest
+from openai import RateLimitError
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+from diff2commit.ai_providers.gemini_provider import GeminiProvider
+from diff2commit.ai_providers.openai_provider import OpenAIProvider
+from diff2commit.ai_providers.openrouter_provider import OpenRouterProvider
+from diff2commit.ai_providers.rate_limit import with_rate_limits
+from diff2commit.config import Diff2CommitConfig
+
+
+def test_parse_message_splits_subject_body_footer(mock_config: Diff2CommitConfig) -> None:
+    """Test parsing a full Conventional Commit message."""
+    provider = OpenAIProvider(mock_config)
+    text = (
+        "feat(api): add search endpoint\r\n"
+        "\r\n"
+        "- Add SearchController\r\n"
+        "- Index titles\r\n"
+        "\r\n"
+        "BREAKING CHANGE: drop v1 search\r\n"
+        "Refs: #12\r\n"
+    )
+
+    message = provider._parse_message(text, tokens=10, cost=0.0)
+
+    assert message.subject == "feat(api): add search endpoint"
+    assert message.body == "- Add SearchController\n- Index titles"
+    assert message.footer == "BREAKING CHANGE: drop v1 search\nRefs: #12"
+    assert message.provider == "openai"
+    assert message.format() == text.strip().replace("\r\n", "\n")
+
+
+def test_parse_message_without_footer_parsing(mock_config: Diff2CommitConfig) -> None:
+    """Test that providers with parse_footer disabled keep footers in the body."""
+    provider = GeminiProvider(mock_config.model_copy(update={"ai_model": "gemini-pro"}))
+
+    message = provider._parse_message("fix: x\n\nRefs: #1", tokens=0, cost=0.0)
+
+    assert message.body == "Refs: #1"
+    assert message.footer is None
+    assert message.provider == "gemini"
+
+
+def test_parse_message_truncates_long_subject(mock_config: Diff2CommitConfig) -> None:
+    """Test that subjects longer than the limit are truncated."""
+    provider = OpenAIProvider(mock_config)
+
+    message = provider._parse_message("x" * 200, tokens=0, cost=0.0)
+
+    assert len(message.subject) == mock_config.max_subject_length
+    assert message.subject.endswith("...")
+
+
+def _stream_chunks(model: str, pieces: List[str], total_tokens: int) -> List[ChatCompletionChunk]:
+    """Build streamed chunks carrying ``pieces``, then a final usage-only chunk."""
+    base = {"id": "c", "object": "chat.completion.chunk", "created": 0, "model": model}
+    chunks = [
+        ChatCompletionChunk.model_validate(
+            {**base, "choices": [{"index": 0, "delta": {"content": piece}}]}
+        )
+        for piece in pieces
+    ]
+    chunks.append(
+        ChatCompletionChunk.model_validate(
+            {
+                **base,
+                "choices": [],
+                "usage": {
+                    "prompt_tokens": total_tokens - 4,
+                    "completion_tokens": 4,
+                    "total_tokens": total_tokens,
+                },
+            }
+        )
+    )
+    return chunks
+
+
+def test_astream_collects_pieces_and_final_usage(mock_config: Diff2CommitConfig) -> None:
+    """Test that async streaming reports each piece and takes usage from the last chunk."""
+    provider = OpenAIProvider(mock_config)
+    chunks = _stream_chunks("gpt-4", ["feat: add", " search\n\nBody"], 12)
+
+    async def fake_stream() -> AsyncIterator[ChatCompletionChunk]:
+        for chunk in chunks:
+            yield chunk
+
+    async def fake_create(**kwargs: Any) -> AsyncIterator[ChatCompletionChunk]:
+        assert kwargs["stream"] is True
+        return fake_stream()
+
+    seen: List[str] = []
+    with patch.object(provider.aclient.chat.completions, "create", side_effect=fake_create):
+        message = asyncio.run(provider.astream_commit_message("diff", {}, seen.append))
+
+    assert seen == ["feat: add", " search\n\nBody"]
+    assert message.subject == "feat: add search"
+    assert message.body == "Body"
+    assert message.tokens_used == 12
+
+
+def test_aclose_closes_async_client(mock_config: Diff2CommitConfig) -> None:
+    """Test that closing a wrapped provider releases the inner async client."""
+    provider = with_rate_limits(OpenAIProvider(mock_config), "openai")
+    inner = provider.inner  # type: ignore[attr-defined]
+
+    asyncio.run(provider.aclose())
+
+    assert inner.aclient.is_closed()
+
+
+def test_generate_candidates_uses_one_request(mock_config: Diff2CommitConfig) -> None:
+    """Test that OpenAI candidates come from a single request with ``n`` choices."""
+    provider = OpenAIProvider(mock_config)
+    response = ChatCompletion.model_validate(
+        {
+            "id": "c",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "gpt-4",
+            "choices": [
+                {
+                    "index": i,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": f"feat: option {i}"},
+                }
+                for i in range(3)
+            ],
+            "usage": {"prompt_tokens": 90, "completion_tokens": 10, "total_tokens": 100},
+        }
+    )
+
+    with patch.object(provider.client.chat.completions, "create", return_value=response) as create:
+        messages = provider.generate_candidates("diff", {"files_changed": ["a.py"]}, k=3)
+
+    create.assert_called_once()
+    assert create.call_args.kwargs["n"] == 3
+    assert [m.subject for m in messages] == ["feat: option 0", "feat: option 1", "feat: option 2"]
+    assert sum(m.tokens_used for m in messages) == 100
+
+
+def _openrouter_provider() -> OpenRouterProvider:
+    """Create an OpenRouter provider for a paid model."""
+    config = Diff2CommitConfig(
+        ai_provider="openrouter",
+        ai_model="openai/gpt-4",
+        api_key="test-api-key",
+        track_usage=False,
+    )
+    return OpenRouterProvider(config)
+
+
+def _rate_limit_error(reset: Optional[str]) -> RateLimitError:
+    """Build a 429 error carrying an optional ``x-ratelimit-reset`` header."""
+    headers = {} if reset is None else {"x-ratelimit-reset": reset}
+    return RateLimitError(
+        "rate limited", response=Mock(status_code=429, headers=headers), body=None
+    )
+
+
+def _reset_in(seconds: float) -> str:
+    """Format a reset time ``seconds`` from now the way OpenRouter does, in epoch milliseconds."""
+    return str(int((time.time() + seconds) * 1000))
+
+
+def test_openrouter_retries_rate_limit_that_resets_soon() -> None:
+    """Test that a rate limit resetting within the retry window is retried."""
+    provider = _openrouter_provider()
+    response = ChatCompletion.model_validate(
+        {
+            "id": "c",
+            "object": "chat.completion",
+            "created": 0,
+            "model": provider.model,
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": "fix: retry"},
+                }
+            ],
+        }
+    )
+    side_effect = [_rate_limit_error(_reset_in(1)), response]
+
+    with patch.object(
+        provider.client.chat.completions, "create", side_effect=side_effect
+    ) as create, patch("diff2commit.retry.time.sleep") as sleep:
+        message = provider.generate_commit_message("diff", {})
+
+    assert message.subject == "fix: retry"
+    assert create.call_count == 2
+    sleep.assert_called_once()
+
+
+def test_openrouter_fails_fast_on_distant_rate_limit_reset() -> None:
+    """Test that a rate limit resetting after the retry window is raised without retrying."""
+    provider = _openrouter_provider()
+
+    with patch.object(
+        provider.client.chat.completions, "create", side_effect=_rate_limit_error(_reset_in(60))
+    ) as create, patch("diff2commit.retry.time.sleep") as sleep:
+        with pytest.raises(RuntimeError, match="OpenRouter API error"):
+            provider.generate_commit_message("diff", {})
+        # The recorded reset time now rejects requests before they are sent
+        with pytest.raises(RuntimeError, match="rate limit reached"):
+            provider.generate_commit_message("diff", {})
+
+    create.assert_called_once()
+    sleep.assert_not_called()
+
+
+@pytest.mark.parametrize("reset", [None, "soon"])
+def test_openrouter_rate_limit_without_usable_reset_header(reset: Optional[str]) -> None:
+    """Test that a missing or unparseable reset header falls back to normal retries."""
+    provider = _openrouter_provider()
+
+    assert provider._rate_limit_exhausted(_rate_limit_error(reset)) is False
+    assert provider._rate_limit_reset is None
+    provider._check_rate_limit()
+
+
+def test_openrouter_stream_collects_pieces_and_final_usage() -> None:
+    """Test that OpenRouter streaming reports each piece and prices the final usage."""
+    provider = _openrouter_provider()
+    chunks = _stream_chunks(provider.model, ["fix: handle", " empty diffs"], 30)
+
+    seen: List[str] = []
+    with patch.object(
+        provider.client.chat.completions, "create", return_value=iter(chunks)
+    ) as create:
+        message = provider.stream_commit_message("diff", {}, seen.append)
+
+    assert create.call_args.kwargs["stream_options"] == {"include_usage": True}
+    assert provider.client.default_headers["X-Title"] == "diff2commit"
+    assert seen == ["fix: handle", " empty diffs"]
+    assert message.subject == "fix: handle empty diffs"
+    assert (message.tokens_used, message.provider) == (30, "openrouter")
+    assert message.cost > 0
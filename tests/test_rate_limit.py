@@ -0,0 +1,84 @@
+"""Tests for client-side rate limiting."""
+
+import asyncio
+import time
+from typing import Any, Dict
+
+from diff2commit.ai_providers.base import AIProvider, CommitMessage
+from diff2commit.ai_providers.openai_provider import OpenAIProvider
+from diff2commit.ai_providers.rate_limit import (
+    AsyncRateLimiter,
+    RateLimitedProvider,
+    with_rate_limits,
+)
+from diff2commit.config import Diff2CommitConfig
+
+
+def test_limiter_waits_once_bucket_is_full() -> None:
+    """Test that requests beyond the rate wait for the bucket to drain."""
+    limiter = AsyncRateLimiter(2, period=0.2)
+
+    async def run() -> float:
+        start = time.monotonic()
+        for _ in range(3):
+            await limiter.acquire()
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) >= 0.09
+
+
+def test_rate_limited_provider_caps_concurrency(mock_config: Diff2CommitConfig) -> None:
+    """Test that the wrapper bounds in-flight requests and debits tokens."""
+    in_flight = 0
+    peak = 0
+
+    class SlowProvider(OpenAIProvider):
+        async def agenerate_commit_message(
+            self, diff: str, context: Dict[str, Any]
+        ) -> CommitMessage:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return CommitMessage(subject="feat: x", tokens_used=10)
+
+    provider = RateLimitedProvider(
+        SlowProvider(mock_config), rpm=1000, tpm=100_000, max_concurrent=2
+    )
+    messages = asyncio.run(provider.agenerate_many([("diff", {})] * 5))
+
+    assert len(messages) == 5
+    assert peak == 2
+    assert provider._tokens._level > 0
+
+
+def test_with_rate_limits_unknown_profile(mock_config: Diff2CommitConfig) -> None:
+    """Test that unknown profiles leave the provider unwrapped."""
+    provider = OpenAIProvider(mock_config)
+    assert with_rate_limits(provider, "unknown") is provider
+    assert isinstance(with_rate_limits(provider, "openai"), RateLimitedProvider)
+
+
+def test_rate_limited_provider_supports_inherited_helpers(mock_config: Diff2CommitConfig) -> None:
+    """Test that AIProvider methods work on the wrapper, which skips AIProvider.__init__."""
+
+    class EchoProvider(OpenAIProvider):
+        async def agenerate_commit_message(
+            self, diff: str, context: Dict[str, Any]
+        ) -> CommitMessage:
+            return CommitMessage(subject=f"feat: {diff}", tokens_used=10)
+
+    inner = EchoProvider(mock_config)
+    provider = RateLimitedProvider(inner, rpm=1000, tpm=100_000, max_concurrent=2)
+    message = CommitMessage(subject="feat: cached")
+
+    messages = asyncio.run(provider.agenerate_many([("one", {}), ("two", {})]))
+    # Run the base default rather than the wrapper's delegating override
+    candidates = AIProvider.generate_candidates(provider, "three", {}, k=2)
+
+    assert [m.subject for m in messages] == ["feat: one", "feat: two"]
+    assert [m.subject for m in candidates] == ["feat: three", "feat: three"]
+    assert provider._build_user_prompt("diff", {}) == inner._build_user_prompt("diff", {})
+    assert provider._cached_generate("prompt", "system", lambda: message) is message
+    assert provider._parse_message("fix: y\n\nBody", 1, 0.0).body == "Body"
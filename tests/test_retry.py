@@ -0,0 +1,89 @@
+"""Tests for retry helpers."""
+
+import asyncio
+from typing import List
+
+import pytest
+from pytest import MonkeyPatch
+
+from diff2commit import retry
+from diff2commit.retry import aretry_call, retry_call
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch: MonkeyPatch) -> List[float]:
+    """Record backoff delays instead of sleeping."""
+    delays: List[float] = []
+
+    async def fake_async_sleep(delay: float) -> None:
+        delays.append(delay)
+
+    monkeypatch.setattr(retry.time, "sleep", delays.append)
+    monkeypatch.setattr(retry.asyncio, "sleep", fake_async_sleep)
+    return delays
+
+
+def test_retry_call_succeeds_after_failures(no_sleep: List[float]) -> None:
+    """Test that retryable errors are retried with growing delays."""
+    calls = []
+
+    def flaky() -> str:
+        calls.append(1)
+        if len(calls) < 3:
+            raise ConnectionError("boom")
+        return "ok"
+
+    assert retry_call(flaky, exceptions=(ConnectionError,), attempts=3) == "ok"
+    assert len(calls) == 3
+    assert len(no_sleep) == 2
+    assert 2 <= no_sleep[0] <= 2.5
+    assert 4 <= no_sleep[1] <= 4.5
+
+
+def test_retry_call_reraises_last_error() -> None:
+    """Test that the original error surfaces once attempts are exhausted."""
+
+    def always_fails() -> None:
+        raise ConnectionError("boom")
+
+    with pytest.raises(ConnectionError):
+        retry_call(always_fails, exceptions=(ConnectionError,), attempts=2)
+
+
+def test_retry_call_does_not_retry_other_errors(no_sleep: List[float]) -> None:
+    """Test that non-retryable errors propagate immediately."""
+
+    def fails() -> None:
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        retry_call(fails, exceptions=(ConnectionError,), attempts=3)
+    assert no_sleep == []
+
+
+def test_aretry_call_succeeds_after_failure(no_sleep: List[float]) -> None:
+    """Test the async variant."""
+    calls = []
+
+    async def flaky() -> str:
+        calls.append(1)
+        if len(calls) < 2:
+            raise ConnectionError("boom")
+        return "ok"
+
+    assert asyncio.run(aretry_call(flaky, exceptions=(ConnectionError,))) == "ok"
+    assert len(no_sleep) == 1
+
+
+def test_retry_call_give_up_reraises_immediately(no_sleep: List[float]) -> None:
+    """Test that give_up short-circuits the remaining attempts."""
+    calls = []
+
+    def always_fails() -> None:
+        calls.append(1)
+        raise ConnectionError("boom")
+
+    with pytest.raises(ConnectionError):
+        retry_call(always_fails, exceptions=(ConnectionError,), attempts=5, give_up=lambda e: True)
+    assert len(calls) == 1
+    assert no_sleep == []
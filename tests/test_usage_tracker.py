@@ -0,0 +1,134 @@
+"""Tests for usage tracking."""
+
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from diff2commit.usage_tracker import UsageRecord, UsageTracker
+
+
+def test_batch_writes_rows_once_on_exit(tmp_path: Path) -> None:
+    """Test that records inside a batch are buffered and inserted together."""
+    tracker = UsageTracker(tmp_path / "usage.db")
+
+    with patch.object(tracker, "_insert", wraps=tracker._insert) as insert, tracker.batch():
+        tracker.record_usage("openai", "gpt-4", 10, 0.01)
+        tracker.record_usage("openai", "gpt-4", 0, 0.0, success=False)
+        assert tracker.get_total_usage()["total_requests"] == 0
+
+    insert.assert_called_once()
+    totals = tracker.get_total_usage()
+    assert totals["total_requests"] == 2
+    assert totals["successful_requests"] == 1
+
+
+def test_database_uses_wal(tmp_path: Path) -> None:
+    """Test that the usage database is switched to write-ahead logging."""
+    tracker = UsageTracker(tmp_path / "usage.db")
+
+    assert tracker._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert tracker._conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+    tracker.close()
+
+
+def test_record_usage_many(tmp_path: Path) -> None:
+    """Test bulk recording and that the data survives reopening the database."""
+    tracker = UsageTracker(tmp_path / "usage.db")
+    tracker.record_usage_many(
+        UsageRecord(1735689600, "openai", "gpt-4", 10 * i, 0.01, True) for i in range(3)
+    )
+    tracker.close()
+
+    totals = UsageTracker(tmp_path / "usage.db").get_total_usage()
+    assert totals["total_requests"] == 3
+    assert totals["total_tokens"] == 30
+
+
+def test_reporting_queries_use_indexes(tmp_path: Path) -> None:
+    """Test that the time-range and grouping queries are answered from indexes."""
+    tracker = UsageTracker(tmp_path / "usage.db")
+
+    plan = " ".join(
+        row[-1]
+        for row in tracker._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM usage WHERE timestamp >= ?", ("2025",)
+        )
+    )
+    assert "idx_usage_ts" in plan
+
+    plan = " ".join(
+        row[-1]
+        for row in tracker._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT provider, model, SUM(tokens), SUM(cost) "
+            "FROM usage GROUP BY provider, model"
+        )
+    )
+    assert "COVERING INDEX idx_usage_provider_model" in plan
+
+
+def _legacy_usage_db(db_path: Path, *timestamps: str) -> None:
+    """Create a usage database in the old layout, with text timestamps."""
+    conn = sqlite3.connect(str(db_path))
+    conn.execute(
+        "CREATE TABLE usage (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL, "
+        "provider TEXT NOT NULL, model TEXT NOT NULL, tokens INTEGER NOT NULL, "
+        "cost REAL NOT NULL, success INTEGER NOT NULL)"
+    )
+    conn.executemany(
+        "INSERT INTO usage (timestamp, provider, model, tokens, cost, success) "
+        "VALUES (?, 'openai', 'gpt-4', 5, 0.5, 1)",
+        [(timestamp,) for timestamp in timestamps],
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_text_timestamps_are_migrated(tmp_path: Path) -> None:
+    """Test that databases with ISO-8601 text timestamps are converted to epoch seconds."""
+    db_path = tmp_path / "usage.db"
+    recent = datetime.now() - timedelta(days=1)
+    _legacy_usage_db(db_path, recent.isoformat())
+
+    tracker = UsageTracker(db_path)
+
+    assert tracker._conn.execute("SELECT typeof(timestamp) FROM usage").fetchone()[0] == "integer"
+    recent_rows = tracker.get_recent_usage()
+    assert len(recent_rows) == 1
+    assert recent_rows[0]["timestamp"] == recent.replace(microsecond=0).isoformat()
+    assert "idx_usage_ts" in {row[1] for row in tracker._conn.execute("PRAGMA index_list(usage)")}
+
+
+def test_migration_keeps_rows_with_bad_timestamps(tmp_path: Path) -> None:
+    """Test that one malformed legacy timestamp does not abort the migration."""
+    db_path = tmp_path / "usage.db"
+    _legacy_usage_db(db_path, datetime.now().isoformat(), "yesterday-ish")
+
+    tracker = UsageTracker(db_path)
+
+    timestamps = [
+        row[0] for row in tracker._conn.execute("SELECT timestamp FROM usage ORDER BY id")
+    ]
+    assert len(timestamps) == 2
+    assert timestamps[1] == 0
+    assert tracker._conn.execute("SELECT SUM(cost) FROM usage").fetchone()[0] == 1.0
+
+
+def test_writes_from_threads_share_one_connection(tmp_path: Path) -> None:
+    """Test that concurrent writers are serialized and the context manager closes the tracker."""
+    with UsageTracker(tmp_path / "usage.db") as tracker:
+        threads = [
+            threading.Thread(target=tracker.record_usage, args=("openai", "gpt-4", 10, 0.01))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert tracker.get_total_usage()["total_requests"] == 8
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        tracker.get_total_usage()
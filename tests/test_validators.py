@@ -0,0 +1,53 @@
+"""Tests for commit message validation."""
+
+import pytest
+
+from diff2commit.validators import CommitMessageValidator
+
+
+def test_validate_conventional() -> None:
+    """Test subject checks on a multi-line message."""
+    validator = CommitMessageValidator()
+
+    assert validator.validate_conventional("feat(api): add search\n\nBody") == (True, [])
+
+    valid, errors = validator.validate_conventional("feat: added search.\nBody")
+    assert not valid
+    assert len(errors) == 3
+
+
+def test_extract_breaking_changes() -> None:
+    """Test breaking changes from the footer and from the subject marker."""
+    validator = CommitMessageValidator()
+
+    assert validator.extract_breaking_changes("feat: x\n\nBREAKING CHANGE: drop v1\nRefs: #1") == (
+        "drop v1"
+    )
+    assert validator.extract_breaking_changes("feat!: x") == "Breaking change indicated in subject"
+    assert validator.extract_breaking_changes("feat: x") is None
+
+
+@pytest.mark.parametrize(
+    "diff, expected",
+    [
+        ("+++ b/src/app.py\n+def run(): pass", "feat"),
+        ("+++ b/src/app.py\n+# handle Error", "fix"),
+        ("+raise Error\n+++ b/tests/test_app.py", "test"),
+        ("+++ b/.github/workflows/ci.yml", "ci"),
+        ("+erroreadme", "docs"),
+    ],
+)
+def test_suggest_type(diff: str, expected: str) -> None:
+    """Test that the highest-priority matching type wins."""
+    assert CommitMessageValidator().suggest_type(diff) == expected
+
+
+def test_body_line_length() -> None:
+    """Test that body lines are split on real newlines and long ones reported."""
+    validator = CommitMessageValidator()
+    body = "short\n" + "x" * 101 + "\nshort"
+
+    assert validator.validate_body_line_length(body) == (False, [2])
+    assert validator.validate_body_line_length("a\nb") == (True, [])
+    assert validator.is_body_valid(body) is False
+    assert validator.is_body_valid("a\nb") is True